@@ -1,21 +1,114 @@
-import streamlit as st
 import asyncio
-import tempfile
-import os
-import uuid
+import atexit
+import hashlib
 import json
-from langchain_core.messages import HumanMessage, AIMessage
+import logging
+import os
+import secrets
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import streamlit as st
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
 
 # --- 딥리서치 빌더 임포트 ---
 # ❗️ 프로젝트 구조에 맞게 경로를 확인해주세요.
+from lawdeepresearch.llm import get_model
 from lawdeepresearch.research_agent_full import deep_researcher_builder
 
+# uvloop은 Windows를 지원하지 않으므로, 설치되어 있고 지원되는 플랫폼에서만 사용합니다.
+try:
+    if sys.platform == "win32":
+        raise ImportError
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# 로그 레벨은 LOG_LEVEL 환경 변수로 정합니다(기본 WARNING). 도구 호출 로그는 DEBUG에서만 출력됩니다.
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING").upper())
+
+
+# 업로드 파일을 디스크로 복사할 때 사용하는 버퍼 크기(1 MiB)
+UPLOAD_COPY_CHUNK_SIZE = 1024 * 1024
+# 스트리밍 중인 답변을 다시 그리는 최소 간격(초). 초당 약 20회까지만 렌더링합니다.
+ANSWER_RENDER_INTERVAL = 0.05
+
+
+def tool_query(tool_input: dict) -> str:
+    """도구 입력에서 화면에 표시할 검색어를 꺼냅니다. 'query'가 없을 때만 JSON으로 직렬화합니다."""
+    query = tool_input.get("query")
+    return query if query else json.dumps(tool_input, ensure_ascii=False)
+
+
+# 도구 이름 -> 분석 로그 한 줄을 만드는 함수. 검색어를 보여주는 도구만 tool_query를 호출합니다.
+TOOL_LOG_FORMATTERS = {
+    "statute_search": lambda tool_input: f"⚖️ **법령 검색:** '{tool_query(tool_input)}'",
+    "case_law_search": lambda tool_input: f"👨‍⚖️ **판례 검색:** '{tool_query(tool_input)}'",
+    "verify_identity_assumptions": lambda tool_input: "👤 **명의자 확인:** 계약서와 등기부등본의 명의자를 비교합니다.",
+    "think_tool": lambda tool_input: "🤔 **분석 계획 수립 중...**",
+    "tavily_search": lambda tool_input: f"🌐 **웹 정보 검색:** '{tool_query(tool_input)}'",
+}
+
+
+def last_ai_content(messages: list) -> str:
+    """메시지 목록의 마지막 AI 메시지 내용을 반환합니다. 보통 마지막 메시지가 AI 메시지이므로 곧바로 끝납니다."""
+    return next(
+        (m.content for m in reversed(messages) if getattr(m, "type", None) == "ai"),
+        "",
+    )
+
+
+def iter_tool_calls(update: dict):
+    """노드의 상태 업데이트에 담긴 AI 메시지들의 도구 호출을 차례로 돌려줍니다."""
+    for key in ("researcher_messages", "supervisor_messages"):
+        for message in update.get(key) or ():
+            yield from getattr(message, "tool_calls", None) or ()
+
+
+@st.cache_resource
+def get_upload_dir() -> str:
+    """업로드 파일을 보관할 디렉터리를 만듭니다. 프로세스가 살아 있는 동안 유지됩니다.
+
+    캐시 항목이 밀려나도 파일은 지워지지 않으므로, 사용자의 계약서·등기부등본이
+    디스크에 남지 않도록 프로세스 종료 시 디렉터리를 통째로 삭제합니다.
+    """
+    upload_dir = tempfile.mkdtemp(prefix="lawdeepresearch-uploads-")
+    atexit.register(shutil.rmtree, upload_dir, ignore_errors=True)
+    return upload_dir
+
+
+@st.cache_resource(max_entries=32)
+def persist_upload(file_name: str, digest: str, _uploaded_file) -> str:
+    """업로드 파일을 (이름, 내용 해시) 단위로 한 번만 디스크에 저장하고 경로를 반환합니다.
+
+    같은 파일로 후속 질문을 해도 다시 쓰지 않고 캐시된 경로를 재사용합니다.
+    """
+    file_dir = os.path.join(get_upload_dir(), digest)
+    os.makedirs(file_dir, exist_ok=True)
+    return save_upload(_uploaded_file, os.path.join(file_dir, file_name))
+
+
+def store_upload(uploaded_file) -> str:
+    """업로드 파일 내용의 해시를 계산해 캐시된 저장 경로를 가져옵니다."""
+    digest = hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()
+    return persist_upload(uploaded_file.name, digest, uploaded_file)
+
+
+def save_upload(uploaded_file, file_path: str) -> str:
+    """업로드된 파일을 디스크에 저장하고 저장된 경로를 반환합니다."""
+    uploaded_file.seek(0)
+    with open(file_path, "wb") as out_file:
+        shutil.copyfileobj(uploaded_file, out_file, length=UPLOAD_COPY_CHUNK_SIZE)
+    return file_path
+
 
 # --- LangGraph 객체 초기화 (캐싱) ---
 @st.cache_resource
 def get_research_scope():
-    from langgraph.checkpoint.memory import InMemorySaver
-
     checkpointer = InMemorySaver()
     scope = deep_researcher_builder.compile(checkpointer=checkpointer)
     return scope
@@ -23,33 +116,121 @@ def get_research_scope():
 
 scope = get_research_scope()
 
+
+# --- 이벤트 루프 정책 설정 (프로세스당 1회) ---
+@st.cache_resource
+def install_event_loop_policy() -> bool:
+    """uvloop 이벤트 루프 정책을 설치합니다. Streamlit 재실행 시 다시 설치하지 않도록 캐싱합니다."""
+    if uvloop is None:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+@st.cache_resource
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """백그라운드 스레드에서 계속 실행되는 이벤트 루프를 생성합니다. (프로세스당 1개)"""
+    install_event_loop_policy()
+    loop = asyncio.new_event_loop()
+    threading.Thread(
+        target=loop.run_forever, name="analysis-event-loop", daemon=True
+    ).start()
+    return loop
+
+
+def run_async(coro):
+    """코루틴을 공유 이벤트 루프에서 실행하고, 완료될 때까지 기다려 결과를 반환합니다.
+
+    루프 스레드는 모든 세션이 함께 쓰므로 ScriptRunContext를 붙이지 않습니다.
+    st.* 호출은 항상 이 함수를 부른 스크립트 스레드에서만 합니다.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+
+def iterate_async(agen):
+    """비동기 제너레이터를 공유 이벤트 루프에서 한 단계씩 진행시키는 동기 이터레이터로 감쌉니다.
+
+    사용자가 중지하거나 스크립트가 재실행되어 반복이 중간에 끝나면, 제너레이터를 aclose()해
+    진행 중이던 그래프 실행도 함께 정리합니다.
+    """
+    try:
+        while True:
+            try:
+                yield run_async(agen.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        run_async(agen.aclose())
+
+
+@st.cache_resource
+def warm_up_research_scope() -> None:
+    """첫 질문이 그래프 준비 비용을 치르지 않도록 백그라운드에서 미리 예열합니다. (프로세스당 1회)
+
+    서브그래프 구성은 항상 미리 해두고, LAWRESEARCH_WARMUP 환경 변수가 설정된 경우에만
+    공유 Gemini 클라이언트에 짧은 요청(출력 1토큰)을 한 번 보내 연결을 미리 맺어 둡니다.
+    그래프 전체를 실행하지 않으므로 체크포인트를 남기거나 LLM 호출을 여러 번 하지 않습니다.
+    """
+    threading.Thread(
+        target=scope.get_graph, kwargs={"xray": True}, name="graph-warmup", daemon=True
+    ).start()
+
+    if os.environ.get("LAWRESEARCH_WARMUP"):
+        asyncio.run_coroutine_threadsafe(
+            get_model(max_output_tokens=1).ainvoke("ping"),
+            get_event_loop(),
+        )
+
+
+warm_up_research_scope()
+
 # --- 페이지 설정 ---
 st.set_page_config(page_title="부동산 계약 안심 스캐너 🛡️", layout="wide")
 st.title("부동산 계약 안심 스캐너 🛡️")
 
 # --- 1. 왼쪽 사이드바: 파일 업로드 ---
-with st.sidebar:
+# 파일 업로더 조작은 프래그먼트만 다시 실행하므로, 채팅 기록을 다시 그리지 않습니다.
+@st.fragment
+def render_sidebar():
     st.header("파일 업로드")
-    uploaded_files = st.file_uploader(
+    st.file_uploader(
         "계약서, 등기부등본 등 분석할 파일을 올려주세요.",
         type=["pdf", "png", "jpg", "jpeg"],
         accept_multiple_files=True,
+        key="uploaded_files",
     )
     st.info("파일을 업로드한 후, 중앙 화면 하단 채팅창에 질문을 입력하세요.")
 
+
+with st.sidebar:
+    render_sidebar()
+
+# 업로드된 파일 목록은 위젯 key로 세션 상태에서 읽습니다.
+uploaded_files = st.session_state.get("uploaded_files") or []
+
 # --- 2. 중앙 메인 화면: 채팅창 ---
 # 세션 상태 초기화
 if "messages" not in st.session_state:
     st.session_state.messages = []
 if "thread_id" not in st.session_state:
-    st.session_state.thread_id = str(uuid.uuid4())
+    st.session_state.thread_id = secrets.token_hex(8)
+
+# 세션 상태 프록시를 매번 거치지 않도록 지역 변수로 한 번만 가져옵니다.
+chat_history = st.session_state.messages
+thread_id = st.session_state.thread_id
+
 
 # 이전 대화 내용 표시
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        if "files" in message and message["files"]:
-            st.markdown(f"📄 *첨부 파일: {', '.join(message['files'])}*")
-        st.markdown(message["content"])
+@st.fragment
+def render_history():
+    for message in chat_history:
+        with st.chat_message(message["role"]):
+            if "files" in message and message["files"]:
+                st.markdown(f"📄 *첨부 파일: {', '.join(message['files'])}*")
+            st.markdown(message["content"])
+
+
+render_history()
 
 # 화면 하단에 고정되는 채팅 입력창
 if prompt := st.chat_input("파일을 올리고 질문을 입력하세요..."):
@@ -61,7 +242,7 @@ if prompt := st.chat_input("파일을 올리고 질문을 입력하세요..."):
         st.markdown(prompt)
 
     # 메시지 기록 저장
-    st.session_state.messages.append(
+    chat_history.append(
         {"role": "user", "content": prompt, "files": attached_file_names}
     )
 
@@ -70,107 +251,127 @@ if prompt := st.chat_input("파일을 올리고 질문을 입력하세요..."):
     with st.chat_message("assistant"):
         thinking_placeholder = st.empty()
         answer_placeholder = st.empty()
-        temp_dir_obj = None
 
         try:
-            document_paths = []
-            if uploaded_files:
-                temp_dir_obj = tempfile.TemporaryDirectory()
-                for f in uploaded_files:
-                    file_path = os.path.join(temp_dir_obj.name, f.name)
-                    with open(file_path, "wb") as out_file:
-                        out_file.write(f.getbuffer())
-                    document_paths.append(file_path)
-
-            async def stream_analysis():
-                log_messages = ["분석을 시작합니다..."]
-                thinking_placeholder.info("\n\n".join(log_messages))
-
-                config = {"configurable": {"thread_id": st.session_state.thread_id}}
+            async def stream_analysis(result: dict):
+                """그래프 이벤트를 (종류, 내용) 조각으로 흘려보내는 비동기 제너레이터.
+
+                ("log", 분석 로그 한 줄) 또는 ("answer", 지금까지 생성된 최종 답변)을 돌려줍니다.
+                화면 그리기는 스크립트 스레드에서 하도록 여기서는 st.*를 호출하지 않고,
+                끝나면 최종 답변을 result["answer"]에 담습니다.
+                """
+                # 직전에 남긴 로그가 think_tool 로그인지 여부 (연속 호출 시 한 줄만 남기기 위함)
+                last_was_think = False
+                yield "log", "분석을 시작합니다..."
+
+                # 업로드 파일 저장은 스레드로 넘겨 이벤트 루프를 막지 않고, 여러 파일을 동시에 씁니다.
+                document_paths = list(
+                    await asyncio.gather(
+                        *(asyncio.to_thread(store_upload, f) for f in uploaded_files)
+                    )
+                )
+
+                config = {"configurable": {"thread_id": thread_id}}
                 inputs = {
                     "messages": [HumanMessage(content=prompt)],
                     "document_paths": document_paths,
                 }
                 final_ai_message = ""
+                has_final_report = False
+                partial_answer = ""
+                last_answer_render = 0.0
 
-                # 디버깅용 expander는 이제 필요 없으므로 주석 처리하거나 삭제해도 됩니다.
-                # debug_expander = st.expander("🕵️‍♂️ 실시간 이벤트 로그 (디버그용)")
-                # events_container = debug_expander.container()
-
-                async for event in scope.astream_events(
-                    inputs, config=config, version="v2"
+                # astream_events 대신 노드 단위 스트림만 구독합니다.
+                # - tasks: 노드 시작 알림, updates: 노드별 상태 변화, messages: LLM 토큰
+                async for namespace, mode, chunk in scope.astream(
+                    inputs,
+                    config=config,
+                    stream_mode=["tasks", "updates", "messages"],
+                    subgraphs=True,
                 ):
-                    # events_container.json(event) # 디버깅 완료 후 비활성화
-
-                    kind, name = event["event"], event["name"]
-
-                    if kind == "on_chain_start" and name == "process_documents":
-                        log_messages.append(
-                            "📂 첨부된 문서들의 내용을 분석하고 있습니다..."
-                        )
-                        thinking_placeholder.info("\n\n".join(log_messages))
-
-                    elif kind == "on_tool_start":
-                        tool_input = event["data"].get("input", {})
-                        query = tool_input.get("query") or json.dumps(
-                            tool_input, ensure_ascii=False
-                        )
-
-                        if name == "statute_search":
-                            log_messages.append(f"⚖️ **법령 검색:** '{query}'")
-                        elif name == "case_law_search":
-                            log_messages.append(f"👨‍⚖️ **판례 검색:** '{query}'")
-                        elif name == "verify_identity_assumptions":
-                            log_messages.append(
-                                "👤 **명의자 확인:** 계약서와 등기부등본의 명의자를 비교합니다."
-                            )
-                        elif name == "think_tool":
-                            if not log_messages[-1].startswith("🤔"):
-                                log_messages.append("🤔 **분석 계획 수립 중...**")
-                        elif name == "tavily_search":
-                            log_messages.append(f"🌐 **웹 정보 검색:** '{query}'")
-
-                        thinking_placeholder.info("\n\n".join(log_messages))
-
-                    # --- 💡 [수정] 'LangGraph' 이름의 최종 이벤트를 정확히 포착 ---
-                    elif kind == "on_chain_end" and name == "LangGraph":
-                        log_messages.append("✍️ 현재까지의 분석을 정리하고 있습니다 ...")
-                        thinking_placeholder.info("\n\n".join(log_messages))
-
-                        final_output_data = event["data"].get("output")
-
-                        if isinstance(final_output_data, dict):
-                            # 우선순위 1: 'final_report' 키가 존재하고 내용이 있다면, 그것을 최종 답변으로 사용
-                            # log_messages.append(
-                            #     "✅ 최종 보고서를 생성하고 있습니다 ..."
-                            # )
-                            report_content = final_output_data.get("final_report")
-                            if report_content:
-                                final_ai_message = report_content
-
-                            # 우선순위 2: 'final_report'가 없다면, 기존처럼 'messages' 리스트에서 마지막 AI 메시지를 찾음
-                            elif (
-                                "messages" in final_output_data
-                                and final_output_data["messages"]
-                            ):
-                                for msg in reversed(final_output_data["messages"]):
-                                    if isinstance(msg, AIMessage):
-                                        final_ai_message = msg.content
-                                        break
-
-                if not final_ai_message:
-                    final_ai_message = "죄송합니다, 답변을 생성하는 데 실패했습니다. 다시 시도해주세요."
-
-                thinking_placeholder.empty()
-                answer_placeholder.markdown(final_ai_message)
-                st.session_state.messages.append(
-                    {"role": "assistant", "content": final_ai_message}
-                )
+                    lines = []
+
+                    match mode, chunk:
+                        # 노드 시작 알림에만 'input' 키가 있습니다.
+                        case "tasks", {"name": "process_documents", "input": _}:
+                            lines.append("📂 첨부된 문서들의 내용을 분석하고 있습니다...")
+                            last_was_think = False
+
+                        case "tasks", {"name": "final_report_generation", "input": _}:
+                            lines.append("✍️ 현재까지의 분석을 정리하고 있습니다 ...")
+                            last_was_think = False
+
+                        case "updates", dict():
+                            for update in chunk.values():
+                                if not isinstance(update, dict):
+                                    continue
+
+                                # 리서처/슈퍼바이저가 요청한 도구 호출을 로그로 보여줍니다.
+                                for tool_call in iter_tool_calls(update):
+                                    is_think = tool_call["name"] == "think_tool"
+                                    # think_tool이 연달아 호출되면 로그를 한 줄만 남깁니다.
+                                    if is_think and last_was_think:
+                                        continue
+                                    format_line = TOOL_LOG_FORMATTERS.get(tool_call["name"])
+                                    if format_line:
+                                        lines.append(format_line(tool_call["args"]))
+                                        last_was_think = is_think
+
+                                # 최상위 그래프의 노드 결과에서 최종 답변을 찾습니다.
+                                # 최종 보고서를 한 번 확보하면 이후에는 다시 찾지 않습니다.
+                                if not namespace and not has_final_report:
+                                    # 우선순위 1: 'final_report'가 있다면, 그것을 최종 답변으로 사용
+                                    report_content = update.get("final_report")
+                                    if report_content:
+                                        final_ai_message = report_content
+                                        has_final_report = True
+                                    # 우선순위 2: 'messages' 리스트의 마지막 AI 메시지 (예: 명확화 질문)
+                                    elif update.get("messages"):
+                                        final_ai_message = (
+                                            last_ai_content(update["messages"])
+                                            or final_ai_message
+                                        )
+
+                        # 최종 보고서 노드의 토큰은 생성되는 대로 답변 영역에 바로 보여줍니다.
+                        case "messages", (
+                            message_chunk,
+                            {"langgraph_node": "final_report_generation"},
+                        ):
+                            token = message_chunk.content
+                            if isinstance(token, str) and token:
+                                partial_answer += token
+                                now = time.monotonic()
+                                if now - last_answer_render > ANSWER_RENDER_INTERVAL:
+                                    yield "answer", partial_answer
+                                    last_answer_render = now
+
+                    for line in lines:
+                        yield "log", "\n\n" + line
+
+                # 최종 보고서가 비어 있으면 스트리밍으로 받은 내용을 대신 사용합니다.
+                result["answer"] = final_ai_message or partial_answer
+
+            def render_analysis(result: dict):
+                """분석 조각을 스크립트 스레드에서 받아, 답변은 바로 그리고 로그는 write_stream으로 넘깁니다."""
+                for kind, value in iterate_async(stream_analysis(result)):
+                    if kind == "answer":
+                        answer_placeholder.markdown(value)
+                    else:
+                        yield value
+
+            result = {}
+            with thinking_placeholder.container(border=True):
+                st.write_stream(render_analysis(result))
 
-            asyncio.run(stream_analysis())
+            final_ai_message = (
+                result.get("answer")
+                or "죄송합니다, 답변을 생성하는 데 실패했습니다. 다시 시도해주세요."
+            )
+            thinking_placeholder.empty()
+            answer_placeholder.markdown(final_ai_message)
+            chat_history.append(
+                {"role": "assistant", "content": final_ai_message}
+            )
 
         except Exception as e:
             st.error(f"오류가 발생했습니다: {e}")
-        finally:
-            if temp_dir_obj:
-                temp_dir_obj.cleanup()
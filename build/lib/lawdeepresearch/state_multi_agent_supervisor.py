@@ -1,46 +0,0 @@
-
-"""
-State Definitions for Multi-Agent Research Supervisor
-
-This module defines the state objects and tools used for the multi-agent
-research supervisor workflow, including coordination state and research tools.
-"""
-
-import operator
-from typing_extensions import Annotated, TypedDict, Sequence
-
-from langchain_core.messages import BaseMessage
-from langchain_core.tools import tool
-from langgraph.graph.message import add_messages
-from pydantic import BaseModel, Field
-
-class SupervisorState(TypedDict):
-    """
-    State for the multi-agent research supervisor.
-    
-    Manages coordination between supervisor and research agents, tracking
-    research progress and accumulating findings from multiple sub-agents.
-    """
-    
-    # Messages exchanged with supervisor for coordination and decision-making
-    supervisor_messages: Annotated[Sequence[BaseMessage], add_messages]
-    # Detailed research brief that guides the overall research direction
-    research_brief: str
-    # Processed and structured notes ready for final report generation
-    notes: Annotated[list[str], operator.add] = []
-    # Counter tracking the number of research iterations performed
-    research_iterations: int = 0
-    # Raw unprocessed research notes collected from sub-agent research
-    raw_notes: Annotated[list[str], operator.add] = []
-
-@tool
-class ConductResearch(BaseModel):
-    """Tool for delegating a research task to a specialized sub-agent."""
-    research_topic: str = Field(
-        description="The topic to research. Should be a single topic, and should be described in high detail (at least a paragraph).",
-    )
-
-@tool
-class ResearchComplete(BaseModel):
-    """Tool for indicating that the research process is complete."""
-    pass
\ No newline at end of file
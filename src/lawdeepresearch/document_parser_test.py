@@ -1,6 +1,9 @@
-# pip install requests
+# pip install "httpx[http2]"
+import asyncio
 import os
-import requests
+from pathlib import Path
+
+import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -11,11 +14,32 @@ filename = "주택임대차표준계약서_test.pdf"
 
 url = "https://api.upstage.ai/v1/document-digitization"
 headers = {"Authorization": f"Bearer {api_key}"}
-files = {"document": open(filename, "rb")}
 data = {"ocr": "force", "model": "document-parse"}
-response = requests.post(url, headers=headers, files=files, data=data)
 
-print(response.json())
+# 여러 문서를 연달아 보낼 때 TLS 연결을 재사용하도록 클라이언트 하나를 공유합니다.
+_CLIENT = httpx.AsyncClient(
+    http2=True,
+    timeout=120,
+    limits=httpx.Limits(max_keepalive_connections=16),
+)
+
+
+async def parse(path: str) -> dict:
+    """Upstage Document AI로 문서 하나를 디지털화한 결과(JSON)를 반환합니다."""
+    with open(path, "rb") as f:
+        files = {"document": (Path(path).name, f.read())}
+    response = await _CLIENT.post(url, headers=headers, files=files, data=data)
+    return response.json()
+
+
+async def main(path: str) -> None:
+    try:
+        print(await parse(path))
+    finally:
+        await _CLIENT.aclose()
+
+
+asyncio.run(main(filename))
 
 # if response.status_code == 200:
 #     result_json = response.json()
@@ -0,0 +1,47 @@
+"""Shared chat model construction.
+
+Every agent module gets its Gemini chat model from here, so the process
+holds a single client (and connection pool) shared by all configurations
+instead of one per module.
+"""
+
+import os
+from functools import cache, lru_cache
+
+from dotenv import load_dotenv
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+MODEL_NAME = "gemini-2.5-flash"
+
+
+@lru_cache(maxsize=1)
+def _base_model() -> ChatGoogleGenerativeAI:
+    """Build the one ChatGoogleGenerativeAI that owns the underlying client."""
+    load_dotenv()
+    return ChatGoogleGenerativeAI(
+        model=MODEL_NAME,
+        api_key=os.getenv("GOOGLE_API_KEY"),
+        temperature=0,
+        convert_system_message_to_human=True,
+    )
+
+
+@cache
+def get_model(**overrides) -> ChatGoogleGenerativeAI:
+    """Return the shared chat model, built once per distinct set of overrides.
+
+    Variants are shallow copies of the base model, so they differ only in
+    request-time settings and keep using the base model's client and its
+    pooled connections.
+
+    Args:
+        **overrides: Request-time ChatGoogleGenerativeAI fields that extend or
+            replace the defaults, e.g. max_output_tokens
+
+    Returns:
+        The memoized ChatGoogleGenerativeAI instance for this configuration
+    """
+    base = _base_model()
+    if not overrides:
+        return base
+    return base.model_copy(update=overrides)
@@ -9,49 +9,37 @@ The supervisor uses parallel research execution to improve efficiency while
 maintaining isolated context windows for each research topic.
 """
 
-import os
 import asyncio
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+import hashlib
+import logging
+import sys
+from functools import lru_cache
+
+from cachetools import TTLCache
 
 from typing_extensions import Literal
 
 from langchain.chat_models import init_chat_model
 from langchain_core.messages import (
     HumanMessage, 
-    BaseMessage, 
     SystemMessage, 
     ToolMessage,
-    filter_messages
 )
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import Command
 
-from lawdeepresearch.prompts import lead_researcher_prompt
-from lawdeepresearch.research_agent import researcher_agent
+from lawdeepresearch.llm import get_model
+from lawdeepresearch.prompts import render_date_suffix, render_lead_researcher_prompt
+from lawdeepresearch.research_agent import prefetch_scope, researcher_agent
 from lawdeepresearch.state_multi_agent_supervisor import (
     SupervisorState, 
     ConductResearch, 
     ResearchComplete
 )
-from lawdeepresearch.utils import get_today_str, think_tool
+from lawdeepresearch.utils import get_today_str, start_search_session, search_summary_registry, think_tool
 
-def get_notes_from_tool_calls(messages: list[BaseMessage]) -> list[str]:
-    """Extract research notes from ToolMessage objects in supervisor message history.
-    
-    This function retrieves the compressed research findings that sub-agents
-    return as ToolMessage content. When the supervisor delegates research to
-    sub-agents via ConductResearch tool calls, each sub-agent returns its
-    compressed findings as the content of a ToolMessage. This function
-    extracts all such ToolMessage content to compile the final research notes.
-    
-    Args:
-        messages: List of messages from supervisor's conversation history
-        
-    Returns:
-        List of research note strings extracted from ToolMessage objects
-    """
-    return [tool_msg.content for tool_msg in filter_messages(messages, include_types="tool")]
+logger = logging.getLogger(__name__)
 
 # Ensure async compatibility for Jupyter environments
 try:
@@ -69,17 +57,27 @@ except ImportError:
 
 # ===== CONFIGURATION =====
 
-supervisor_tools = [ConductResearch, ResearchComplete, think_tool]
+SUPERVISOR_TOOLS = [ConductResearch, ResearchComplete, think_tool]
+# Interned tool names, so dispatch in supervisor_tools is an identity check
+THINK_TOOL_NAME = sys.intern("think_tool")
+CONDUCT_RESEARCH_NAME = sys.intern("ConductResearch")
+RESEARCH_COMPLETE_NAME = sys.intern("ResearchComplete")
 # supervisor_model = init_chat_model(model="anthropic:claude-sonnet-4-20250514")
-load_dotenv()
-API_KEY = os.getenv("GOOGLE_API_KEY")
-supervisor_model = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash", 
-    api_key = API_KEY,
-    temperature=0,
-    convert_system_message_to_human=True 
-)
-supervisor_model_with_tools = supervisor_model.bind_tools(supervisor_tools)
+
+@lru_cache(maxsize=2)
+def get_supervisor_model(first_turn: bool = False):
+    """Bind the supervisor tools on first use rather than at import time.
+
+    The lead researcher prompt goes out as Gemini's native system instruction
+    instead of being folded into an extra human turn on every call. The first
+    turn always has to plan, so it is forced to emit a tool call; later turns
+    keep the default "auto" mode and may answer without tools.
+    """
+    supervisor_model = get_model(convert_system_message_to_human=False)
+    if first_turn:
+        return supervisor_model.bind_tools(SUPERVISOR_TOOLS, tool_choice="any")
+    return supervisor_model.bind_tools(SUPERVISOR_TOOLS)
+
 
 # System constants
 # Maximum number of tool call iterations for individual researcher agents
@@ -90,8 +88,82 @@ max_researcher_iterations = 6 # Calls to think_tool + ConductResearch
 # This is passed to the lead_researcher_prompt to limit parallel research tasks
 max_concurrent_researchers = 3
 
+# Seconds the remaining researchers may still run on the last permitted
+# iteration once the first of them has finished
+final_turn_straggler_timeout = 60
+
+# Researcher outputs keyed by (thread_id, topic digest), so a topic the supervisor
+# re-delegates in a later iteration of the same session is not researched again.
+# Runs without a thread_id bypass it, since they cannot be told apart.
+RESEARCH_RESULT_CACHE = TTLCache(maxsize=128, ttl=600)
+
+# Researcher graph nodes that write compressed_research right before END
+RESEARCHER_TERMINAL_NODES = frozenset(("compress_research",))
+
 # ===== SUPERVISOR NODES =====
 
+def topic_key(research_topic: str) -> str:
+    """Return a short digest identifying a research topic."""
+    return hashlib.blake2b(research_topic.encode("utf-8"), digest_size=16).hexdigest()
+
+
+async def run_researcher(research_topic: str) -> dict:
+    """Run one researcher and return as soon as its findings are written.
+
+    Streams node updates instead of awaiting ainvoke, so the result is handed
+    back the moment compress_research finishes rather than
+    after the graph assembles its full output state.
+
+    Each researcher gets its own search summary registry, so pages its tool
+    calls have already summarized are reused for the rest of its run, and its
+    own prefetch scope, so speculative tool calls do not outlive it.
+
+    Args:
+        research_topic: Topic delegated through ConductResearch
+
+    Returns:
+        Dict with compressed_research and the raw_notes gathered along the way
+    """
+    raw_notes = []
+    session_token = start_search_session()
+    try:
+        # Prefetched tool calls belong to this run and are cancelled when it ends
+        async with prefetch_scope():
+            async for update in researcher_agent.astream(
+                {
+                    "researcher_messages": [HumanMessage(content=research_topic)],
+                    "research_topic": research_topic
+                },
+                stream_mode="updates"
+            ):
+                for node_name, node_update in update.items():
+                    if not node_update:
+                        continue
+                    raw_notes.extend(node_update.get("raw_notes", []))
+                    if node_name in RESEARCHER_TERMINAL_NODES:
+                        return {
+                            "compressed_research": node_update["compressed_research"],
+                            "raw_notes": raw_notes
+                        }
+        return {"raw_notes": raw_notes}
+    finally:
+        search_summary_registry.reset(session_token)
+
+
+@lru_cache(maxsize=4)
+def _build_system_message(date_str: str) -> SystemMessage:
+    """Build the supervisor system message once per day.
+
+    The concurrency and iteration caps are module constants, so the date is
+    the only input that changes; the cached message keeps the prompt prefix
+    byte-identical across supervisor turns.
+    """
+    system_message = render_lead_researcher_prompt(
+        max_concurrent_research_units=max_concurrent_researchers,
+        max_researcher_iterations=max_researcher_iterations
+    ) + render_date_suffix(date=date_str)
+    return SystemMessage(content=system_message)
+
 async def supervisor(state: SupervisorState) -> Command[Literal["supervisor_tools"]]:
     """Coordinate research activities.
     
@@ -107,27 +179,23 @@ async def supervisor(state: SupervisorState) -> Command[Literal["supervisor_tool
         Command to proceed to supervisor_tools node with updated state
     """
     supervisor_messages = state.get("supervisor_messages", [])
+    research_iterations = state.get("research_iterations", 0)
     
     # Prepare system message with current date and constraints
-    system_message = lead_researcher_prompt.format(
-        date=get_today_str(), 
-        max_concurrent_research_units=max_concurrent_researchers,
-        max_researcher_iterations=max_researcher_iterations
-    )
-    messages = [SystemMessage(content=system_message)] + supervisor_messages
+    messages = [_build_system_message(get_today_str())] + supervisor_messages
     
     # Make decision about next research steps
-    response = await supervisor_model_with_tools.ainvoke(messages)
+    response = await get_supervisor_model(first_turn=research_iterations == 0).ainvoke(messages)
     
     return Command(
         goto="supervisor_tools",
         update={
             "supervisor_messages": [response],
-            "research_iterations": state.get("research_iterations", 0) + 1
+            "research_iterations": research_iterations + 1
         }
     )
 
-async def supervisor_tools(state: SupervisorState) -> Command[Literal["supervisor", "__end__"]]:
+async def supervisor_tools(state: SupervisorState, config: RunnableConfig) -> Command[Literal["supervisor", "__end__"]]:
     """Execute supervisor decisions - either conduct research or end the process.
     
     Handles:
@@ -138,27 +206,43 @@ async def supervisor_tools(state: SupervisorState) -> Command[Literal["superviso
     
     Args:
         state: Current supervisor state with messages and iteration count
+        config: Runnable config; its thread_id scopes the research result cache
         
     Returns:
         Command to continue supervision, end process, or handle errors
     """
-    supervisor_messages = state.get("supervisor_messages", [])
-    research_iterations = state.get("research_iterations", 0)
+    thread_id = config.get("configurable", {}).get("thread_id")
+    # Read each state field once; the supervisor node always writes
+    # supervisor_messages and research_iterations before routing here
+    supervisor_messages = state["supervisor_messages"]
+    research_iterations = state["research_iterations"]
+    research_brief = state.get("research_brief", "")
+    notes_so_far = state.get("notes_so_far", [])
     most_recent_message = supervisor_messages[-1]
     
     # Initialize variables for single return pattern
     tool_messages = []
+    research_tool_messages = []
     all_raw_notes = []
     next_step = "supervisor"  # Default next step
     should_end = False
     
+    # Sort the tool calls by kind in a single pass
+    think_tool_calls = []
+    conduct_research_calls = []
+    research_complete = False
+    for tool_call in most_recent_message.tool_calls:
+        name = sys.intern(tool_call["name"])
+        if name is THINK_TOOL_NAME:
+            think_tool_calls.append(tool_call)
+        elif name is CONDUCT_RESEARCH_NAME:
+            conduct_research_calls.append(tool_call)
+        elif name is RESEARCH_COMPLETE_NAME:
+            research_complete = True
+
     # Check exit criteria first
     exceeded_iterations = research_iterations >= max_researcher_iterations
     no_tool_calls = not most_recent_message.tool_calls
-    research_complete = any(
-        tool_call["name"] == "ResearchComplete" 
-        for tool_call in most_recent_message.tool_calls
-    )
     
     if exceeded_iterations or no_tool_calls or research_complete:
         should_end = True
@@ -167,66 +251,123 @@ async def supervisor_tools(state: SupervisorState) -> Command[Literal["superviso
     else:
         # Execute ALL tool calls before deciding next step
         try:
-            # Separate think_tool calls from ConductResearch calls
-            think_tool_calls = [
-                tool_call for tool_call in most_recent_message.tool_calls 
-                if tool_call["name"] == "think_tool"
-            ]
-            
-            conduct_research_calls = [
-                tool_call for tool_call in most_recent_message.tool_calls 
-                if tool_call["name"] == "ConductResearch"
-            ]
-
-            # Handle think_tool calls (synchronous)
-            for tool_call in think_tool_calls:
-                observation = think_tool.invoke(tool_call["args"])
-                tool_messages.append(
+            # think_tool calls have no dependency on the researchers' output, so
+            # both run concurrently instead of reflecting first and researching after
+            async def _think():
+                if not think_tool_calls:
+                    return []
+                # Handle think_tool calls in a single batch
+                observations = await think_tool.abatch(
+                    [tool_call["args"] for tool_call in think_tool_calls],
+                    config={"max_concurrency": len(think_tool_calls)}
+                )
+                return [
                     ToolMessage(
                         content=observation,
                         name=tool_call["name"],
                         tool_call_id=tool_call["id"]
                     )
-                )
-
-            # Handle ConductResearch calls (asynchronous)
-            if conduct_research_calls:
-                # Launch parallel research agents
-                coros = [
-                    researcher_agent.ainvoke({
-                        "researcher_messages": [
-                            HumanMessage(content=tool_call["args"]["research_topic"])
-                        ],
-                        "research_topic": tool_call["args"]["research_topic"]
-                    }) 
-                    for tool_call in conduct_research_calls
+                    for observation, tool_call in zip(observations, think_tool_calls)
                 ]
 
-                # Wait for all research to complete
-                tool_results = await asyncio.gather(*coros)
-
-                # Format research results as tool messages
+            # Launch parallel research agents, at most max_concurrent_researchers at a time
+            sem = asyncio.Semaphore(max_concurrent_researchers)
+
+            async def _run(key, research_topic):
+                cache_key = (thread_id, key) if thread_id is not None else None
+                if cache_key is not None and cache_key in RESEARCH_RESULT_CACHE:
+                    return key, RESEARCH_RESULT_CACHE[cache_key]
+                try:
+                    async with sem:
+                        result = await run_researcher(research_topic)
+                except Exception:
+                    # A failed researcher only loses its own topic; the empty result
+                    # becomes an error ToolMessage and its siblings keep running
+                    logger.exception("Error in researcher for topic %s", key)
+                    return key, {}
+                # Only finished research is reused; a run that ended without
+                # compressed_research gets another chance when re-delegated
+                if cache_key is not None and "compressed_research" in result:
+                    RESEARCH_RESULT_CACHE[cache_key] = result
+                return key, result
+
+            async def _research():
+                # Identical topics in one turn are researched once and the result
+                # is shared by every tool call that asked for it
+                slots_by_topic = {}
+                topics = {}
+                for index, tool_call in enumerate(conduct_research_calls):
+                    research_topic = tool_call["args"]["research_topic"]
+                    key = topic_key(research_topic)
+                    slots_by_topic.setdefault(key, []).append(index)
+                    topics.setdefault(key, research_topic)
+
+                # Format research results as tool messages as each researcher finishes.
                 # Each sub-agent returns compressed research findings in result["compressed_research"]
-                # We write this compressed research as the content of a ToolMessage, which allows
-                # the supervisor to later retrieve these findings via get_notes_from_tool_calls()
-                research_tool_messages = [
-                    ToolMessage(
-                        content=result.get("compressed_research", "Error synthesizing research report"),
-                        name=tool_call["name"],
-                        tool_call_id=tool_call["id"]
-                    ) for result, tool_call in zip(tool_results, conduct_research_calls)
+                # We write this compressed research as the content of a ToolMessage and also
+                # append it to notes_so_far, so the end path does not rescan the message history
+                # Slots are pre-allocated so the message order matches the tool call order.
+                research_tool_messages = [None] * len(conduct_research_calls)
+                research_raw_notes = [[] for _ in conduct_research_calls]
+                # On the last permitted turn the supervisor ends right after this step,
+                # so once one researcher is done the rest only get a short grace period
+                final_turn = research_iterations + 1 >= max_researcher_iterations
+                timeout = None
+                # The task group owns every researcher task: leaving it waits for (or,
+                # after cancellation, reaps) them all, so none outlive this step
+                async with asyncio.TaskGroup() as task_group:
+                    # Tasks are created shortest topic first so similar-length requests
+                    # start together; creating them up front fixes the order they take
+                    # the semaphore in
+                    pending = {
+                        task_group.create_task(_run(key, research_topic))
+                        for key, research_topic in sorted(topics.items(), key=lambda item: len(item[1]))
+                    }
+                    while pending:
+                        done, pending = await asyncio.wait(
+                            pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        if not done:
+                            break
+                        for task in done:
+                            key, result = task.result()
+                            slots = slots_by_topic[key]
+                            for index in slots:
+                                tool_call = conduct_research_calls[index]
+                                research_tool_messages[index] = ToolMessage(
+                                    content=result.get("compressed_research", "Error synthesizing research report"),
+                                    name=tool_call["name"],
+                                    tool_call_id=tool_call["id"]
+                                )
+                            # Keep each researcher's raw notes as-is instead of joining them
+                            # into one more copy of the (often page-sized) note text
+                            research_raw_notes[slots[0]] = result.get("raw_notes", [])
+                        if final_turn:
+                            timeout = final_turn_straggler_timeout
+                    # Cancel the stragglers left after the grace period
+                    for task in pending:
+                        task.cancel()
+
+                # Every tool call still needs a response, including cancelled ones
+                for index, tool_call in enumerate(conduct_research_calls):
+                    if research_tool_messages[index] is None:
+                        research_tool_messages[index] = ToolMessage(
+                            content="Research cancelled: the iteration budget was reached before it finished",
+                            name=tool_call["name"],
+                            tool_call_id=tool_call["id"]
+                        )
+                return research_tool_messages, [
+                    note for notes in research_raw_notes for note in notes
                 ]
-                
-                tool_messages.extend(research_tool_messages)
 
-                # Aggregate raw notes from all research
-                all_raw_notes = [
-                    "\n".join(result.get("raw_notes", [])) 
-                    for result in tool_results
-                ]
-                
-        except Exception as e:
-            print(f"Error in supervisor tools: {e}")
+            think_messages, (research_tool_messages, all_raw_notes) = await asyncio.gather(
+                _think(), _research()
+            )
+            tool_messages.extend(think_messages)
+            tool_messages.extend(research_tool_messages)
+
+        except Exception:
+            logger.exception("Error in supervisor tools")
             should_end = True
             next_step = END
     
@@ -235,8 +376,8 @@ async def supervisor_tools(state: SupervisorState) -> Command[Literal["superviso
         return Command(
             goto=next_step,
             update={
-                "notes": get_notes_from_tool_calls(supervisor_messages),
-                "research_brief": state.get("research_brief", "")
+                "notes": notes_so_far,
+                "research_brief": research_brief
             }
         )
     else:
@@ -244,6 +385,7 @@ async def supervisor_tools(state: SupervisorState) -> Command[Literal["superviso
             goto=next_step,
             update={
                 "supervisor_messages": tool_messages,
+                "notes_so_far": [message.content for message in research_tool_messages],
                 "raw_notes": all_raw_notes
             }
         )
@@ -1,105 +1,357 @@
-import os
-from dotenv import load_dotenv
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
 from pydantic import BaseModel, Field
 from typing_extensions import Literal
-from langchain_google_genai import ChatGoogleGenerativeAI
+from cachetools import TTLCache
 
 from langgraph.graph import StateGraph, START, END
-from langchain_core.messages import SystemMessage, HumanMessage, ToolMessage, filter_messages
+from langchain_core.runnables import RunnableConfig
+from langchain_core.messages import SystemMessage, HumanMessage, ToolMessage, RemoveMessage, get_buffer_string, message_chunk_to_message
 from langchain.chat_models import init_chat_model
 
+# LLMLingua-2 is optional; without it tool outputs are passed to the model unchanged
+try:
+    from llmlingua import PromptCompressor
+except ImportError:
+    PromptCompressor = None
+
+from lawdeepresearch.llm import get_model
 from lawdeepresearch.state_research import ResearcherState, ResearcherOutputState
 from lawdeepresearch.utils import tavily_search, get_today_str, think_tool, case_law_search, statute_search, verify_identity_assumptions
-from lawdeepresearch.prompts import research_agent_prompt, compress_research_system_prompt, compress_research_human_message
+from lawdeepresearch.prompts import research_agent_prompt, compress_research_system_prompt, render_compact_research_history_prompt, render_compress_research_human_message, render_date_suffix
 
 # ===== CONFIGURATION =====
 
 # Set up tools and model binding
 tools = [tavily_search, think_tool, case_law_search, statute_search, verify_identity_assumptions]
-tools_by_name = {tool.name: tool for tool in tools}
+tools_by_name = MappingProxyType({tool.name: tool for tool in tools})
+
+# Message types whose content counts as research notes
+_KEEP_TYPES = frozenset(("tool", "ai"))
+
+# Results of idempotent search tools, keyed by (thread_id, tool name, canonical args)
+TOOL_RESULT_CACHE = TTLCache(maxsize=512, ttl=900)
+UNCACHED_TOOLS = frozenset({"think_tool", "verify_identity_assumptions"})
+
+logger = logging.getLogger(__name__)
+
+# Tool calls started speculatively while llm_call is still streaming, keyed by tool_call id.
+# tool_node picks them up; llm_call cancels the ones its final response does not contain.
+# The dict belongs to one researcher run (see prefetch_scope); outside a run it is None
+# and tool calls are only executed by tool_node.
+prefetched_tool_calls: ContextVar[dict | None] = ContextVar("prefetched_tool_calls", default=None)
+
+@asynccontextmanager
+async def prefetch_scope():
+    """Enable tool-call prefetching for one researcher run.
+
+    Nodes started inside the block share the run's prefetch dict. On exit,
+    including cancellation of the run, every prefetch that was never consumed
+    is cancelled and awaited, so none keep calling search APIs afterwards.
+    """
+    tasks = {}
+    token = prefetched_tool_calls.set(tasks)
+    try:
+        yield
+    finally:
+        prefetched_tool_calls.reset(token)
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+def discard_prefetched_tool_calls(prefetched: dict, tool_call_ids) -> None:
+    """Cancel and forget prefetched tool calls that will never be consumed."""
+    for tool_call_id in tool_call_ids:
+        task = prefetched.pop(tool_call_id, None)
+        if task is not None:
+            task.cancel()
 
 # Initialize models
 
-load_dotenv()
-API_KEY = os.getenv("GOOGLE_API_KEY")
-model = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash", 
-    api_key = API_KEY,
-    temperature=0,
-    convert_system_message_to_human=True 
-)
+model = get_model()
 # model = init_chat_model(model="anthropic:claude-sonnet-4-20250514")
 model_with_tools = model.bind_tools(tools)
 # summarization_model = init_chat_model(model="openai:gpt-4.1-mini")
 # compress_model = init_chat_model(model="openai:gpt-4.1", max_tokens=32000) # model="anthropic:claude-sonnet-4-20250514", max_tokens=64000
-compress_model = model
+# 압축 결과는 개수·길이가 제한된 JSON이므로 출력 토큰 상한을 둡니다.
+compress_model = get_model(max_output_tokens=4096, response_mime_type="application/json")
+
+# Tool outputs longer than this (in characters) are compressed before re-entering the context
+TOOL_OUTPUT_COMPRESSION_THRESHOLD = 2000
+TOOL_OUTPUT_COMPRESSION_RATE = 0.5
+
+_prompt_compressor = None
+_prompt_compressor_lock = threading.Lock()
+
+def get_prompt_compressor():
+    """Load the LLMLingua-2 compressor once, on first use.
+
+    Compression runs in worker threads, so several calls can arrive together on
+    the first turn; the lock makes exactly one of them build the model.
+    """
+    global _prompt_compressor
+    if _prompt_compressor is None:
+        with _prompt_compressor_lock:
+            if _prompt_compressor is None:
+                _prompt_compressor = PromptCompressor(
+                    model_name="microsoft/llmlingua-2-xlm-roberta-large-meetingbank",
+                    use_llmlingua2=True,
+                )
+    return _prompt_compressor
+
+async def compress_tool_output(observation):
+    """Compress a long tool observation with LLMLingua-2, or return it unchanged.
+
+    Compression is CPU-bound, so it runs in a worker thread.
+    """
+    if (
+        PromptCompressor is None
+        or not isinstance(observation, str)
+        or len(observation) <= TOOL_OUTPUT_COMPRESSION_THRESHOLD
+    ):
+        return observation
+    # The compressor is fetched inside the worker thread, so its first-use model
+    # load does not block the event loop either
+    result = await asyncio.to_thread(
+        lambda: get_prompt_compressor().compress_prompt(
+            observation,
+            rate=TOOL_OUTPUT_COMPRESSION_RATE,
+            force_tokens=["\n", "?", ":"],
+        )
+    )
+    return result["compressed_prompt"]
+
+# History compaction: once researcher_messages approach the token budget, everything
+# between the first message (the research topic) and the last few messages is
+# replaced by a single summary message.
+HISTORY_TOKEN_BUDGET = 60000
+HISTORY_COMPACTION_THRESHOLD = 0.9
+HISTORY_KEEP_LAST = 4
+# Rough characters-per-token ratio for mixed Korean/English text; avoids a countTokens round-trip
+CHARS_PER_TOKEN = 3
+
+def estimate_tokens(messages) -> int:
+    """Estimate the token count of messages from their content length."""
+    return sum(len(str(m.content)) for m in messages) // CHARS_PER_TOKEN
+
+async def compact_history(messages, budget_tokens: int = HISTORY_TOKEN_BUDGET):
+    """Summarize the middle of the research transcript when it nears the token budget.
+
+    Returns the compacted message list, the state updates that apply the same
+    compaction to researcher_messages, and the raw text of the removed messages.
+    Returns None when no compaction is needed.
+    """
+    if estimate_tokens(messages) <= budget_tokens * HISTORY_COMPACTION_THRESHOLD:
+        return None
+
+    # Never start the kept tail with a ToolMessage whose tool call would be summarized away
+    cut = len(messages) - HISTORY_KEEP_LAST
+    while cut > 1 and messages[cut].type == "tool":
+        cut -= 1
+    middle = messages[1:cut]
+    if not middle:
+        return None
+
+    # A previous compaction's summary lives in the topic message; fold it into the new one
+    first = messages[0]
+    topic = first.additional_kwargs.get("researchTopic", first.content)
+    transcript = get_buffer_string(middle)
+    previous_summary = first.additional_kwargs.get("researchSummary")
+    if previous_summary:
+        transcript = f"{previous_summary}\n\n{transcript}"
+    summary = await model.ainvoke([
+        HumanMessage(content=render_compact_research_history_prompt(transcript=transcript))
+    ])
+    research_summary = summary.text()
+
+    # The summary joins the topic in the first user turn rather than becoming a turn of
+    # its own, so user and model turns keep alternating (the kept tail starts with an
+    # AI message). Reusing the topic message's id makes add_messages replace it in place.
+    head = HumanMessage(
+        content=f"{topic}\n\n<ResearchSoFar>\n{research_summary}\n</ResearchSoFar>",
+        id=first.id,
+        additional_kwargs={"researchTopic": topic, "researchSummary": research_summary},
+    )
+    compacted = [head] + messages[cut:]
+    updates = [head] + [RemoveMessage(id=m.id) for m in middle]
+    raw_notes = "\n".join(
+        m.artifact if getattr(m, "artifact", None) is not None else str(m.content)
+        for m in middle if m.type in _KEEP_TYPES
+    )
+    return compacted, updates, raw_notes
 
 # ===== AGENT NODES =====
 
-def llm_call(state: ResearcherState):
+def research_system_message() -> SystemMessage:
+    """Build the system message shared by llm_call and compress_research.
+
+    Both calls send this message followed by the same researcher_messages, so the
+    compress call repeats the exact prefix of the last llm_call and Gemini's
+    implicit prompt cache can serve it. The date is the only part that changes,
+    and only once a day.
+    """
+    return SystemMessage(content=research_agent_prompt + render_date_suffix(date=get_today_str()))
+
+async def llm_call(state: ResearcherState, config: RunnableConfig):
     """Analyze current state and decide on next actions.
     
     The model analyzes the current conversation state and decides whether to:
     1. Call search tools to gather more information
     2. Provide a final answer based on gathered information
+
+    The response is streamed, and each tool call is started as soon as it appears
+    in the stream so its latency overlaps the rest of the generation.
     
     Returns updated state with the model's response.
     """
+    messages = list(state["researcher_messages"])
+    updates = []
+    raw_notes = []
+
+    # Keep the prompt within budget; removed messages are preserved in raw_notes
+    compaction = await compact_history(messages)
+    if compaction is not None:
+        messages, updates, removed_notes = compaction
+        raw_notes.append(removed_notes)
+
+    prompt = [research_system_message()] + messages
+    thread_id = config.get("configurable", {}).get("thread_id")
+    prefetched = prefetched_tool_calls.get()
+    response = None
+    # Ids of the tool calls this call prefetched, so the unused ones can be cancelled
+    started_ids = []
+    try:
+        async for chunk in model_with_tools.astream(prompt):
+            response = chunk if response is None else response + chunk
+            if prefetched is None:
+                continue
+            for tool_call in chunk.tool_calls:
+                if tool_call["id"] and tool_call["id"] not in prefetched:
+                    prefetched[tool_call["id"]] = asyncio.create_task(
+                        run_tool_call(tool_call, thread_id)
+                    )
+                    started_ids.append(tool_call["id"])
+    except Exception:
+        logger.warning("Streaming the researcher response failed; retrying without streaming", exc_info=True)
+        response = None
+    if response is None:
+        # Streaming failed or returned nothing; the plain call below issues new
+        # tool call ids, so nothing prefetched from the stream will be consumed
+        if prefetched is not None:
+            discard_prefetched_tool_calls(prefetched, started_ids)
+        response = await model_with_tools.ainvoke(prompt)
+    else:
+        response = message_chunk_to_message(response)
+        # Drop prefetches the final response does not contain. This is checked here
+        # rather than in tool_node, which never runs when the response has no tool calls.
+        if prefetched is not None:
+            final_ids = {tool_call["id"] for tool_call in response.tool_calls}
+            discard_prefetched_tool_calls(prefetched, (i for i in started_ids if i not in final_ids))
     return {
-        "researcher_messages": [
-            model_with_tools.invoke(
-                [SystemMessage(content=research_agent_prompt)] + state["researcher_messages"]
-            )
-        ]
+        "researcher_messages": updates + [response],
+        "raw_notes": raw_notes,
     }
 
-def tool_node(state: ResearcherState):
+async def run_tool_call(tool_call: dict, thread_id=None):
+    """Run a single tool call, returning the error text instead of raising.
+
+    A failing call becomes an error observation for the model to react to,
+    so it cannot cancel or poison the other calls of the same turn.
+    Successful search results are cached per conversation thread; runs without
+    a thread_id bypass the cache, since they cannot be told apart.
+    """
+    cache_key = None
+    if thread_id is not None and tool_call["name"] not in UNCACHED_TOOLS:
+        cache_key = (
+            thread_id,
+            tool_call["name"],
+            json.dumps(tool_call["args"], sort_keys=True, ensure_ascii=False),
+        )
+        if cache_key in TOOL_RESULT_CACHE:
+            return TOOL_RESULT_CACHE[cache_key]
+
+    try:
+        tool = tools_by_name[tool_call["name"]]
+        observation = await tool.ainvoke(tool_call["args"])
+    except Exception as e:
+        return f"Error executing tool '{tool_call['name']}': {e}"
+
+    if cache_key is not None:
+        TOOL_RESULT_CACHE[cache_key] = observation
+    return observation
+
+async def tool_node(state: ResearcherState, config: RunnableConfig):
     """Execute all tool calls from the previous LLM response.
     
-    Executes all tool calls from the previous LLM responses.
+    Executes all tool calls from the previous LLM response concurrently.
     Returns updated state with tool execution results.
     """
     tool_calls = state["researcher_messages"][-1].tool_calls
+    thread_id = config.get("configurable", {}).get("thread_id")
+    prefetched = prefetched_tool_calls.get() or {}
  
-    # Execute all tool calls
-    observations = []
-    for tool_call in tool_calls:
-        tool = tools_by_name[tool_call["name"]]
-        observations.append(tool.invoke(tool_call["args"]))
+    # Execute all tool calls concurrently, reusing the ones llm_call already started;
+    # gather keeps the original order
+    observations = await asyncio.gather(
+        *(
+            prefetched.pop(tool_call["id"], None) or run_tool_call(tool_call, thread_id)
+            for tool_call in tool_calls
+        )
+    )
             
+    # Compress long observations; the original text is kept as the message artifact
+    compressed = await asyncio.gather(
+        *(compress_tool_output(observation) for observation in observations)
+    )
+
     # Create tool message outputs
     tool_outputs = [
         ToolMessage(
-            content=observation,
+            content=content,
+            artifact=observation if content is not observation else None,
             name=tool_call["name"],
             tool_call_id=tool_call["id"]
-        ) for observation, tool_call in zip(observations, tool_calls)
+        ) for content, observation, tool_call in zip(compressed, observations, tool_calls)
     ]
     
     return {"researcher_messages": tool_outputs}
 
-def compress_research(state: ResearcherState) -> dict:
+def collect_raw_notes(messages) -> str:
+    """Join the contents of tool and AI messages into one raw-notes string.
+
+    Compressed tool outputs contribute their original text, kept in the artifact.
+    """
+    return "\n".join(
+        m.artifact if getattr(m, "artifact", None) is not None
+        else m.content if isinstance(m.content, str) else str(m.content)
+        for m in messages
+        if m.type in _KEEP_TYPES
+    )
+
+async def compress_research(state: ResearcherState) -> dict:
     """Compress research findings into a concise summary.
     
     Takes all the research messages and tool outputs and creates
     a compressed summary suitable for the supervisor's decision-making.
     """
     
-    system_message = compress_research_system_prompt.format(date=get_today_str())
-    messages = [SystemMessage(content=system_message)] + state.get("researcher_messages", []) + [HumanMessage(content=compress_research_human_message)]
-    response = compress_model.invoke(messages)
-    
-    # Extract raw notes from tool and AI messages
-    raw_notes = [
-        str(m.content) for m in filter_messages(
-            state["researcher_messages"], 
-            include_types=["tool", "ai"]
-        )
-    ]
+    # Compression instructions go after the history so everything before them is a cached prefix
+    compress_instructions = (
+        compress_research_system_prompt
+        + "\n\n"
+        + render_compress_research_human_message(research_topic=state.get("research_topic", ""))
+    )
+    messages = [research_system_message()] + state.get("researcher_messages", []) + [HumanMessage(content=compress_instructions)]
+    response = await compress_model.ainvoke(messages)
     
     return {
         "compressed_research": str(response.content),
-        "raw_notes": ["\n".join(raw_notes)]
+        "raw_notes": [collect_raw_notes(state["researcher_messages"])]
     }
 
 # ===== ROUTING LOGIC =====
@@ -189,5 +441,5 @@ if __name__ == "__main__":
     contract period from 2025-09-01 to 2027-08-31, 
     that I, as the lessee, should be aware of."""
 
-    result = researcher_agent.invoke({"researcher_messages": [HumanMessage(content=f"{research_brief}.")]})
+    result = asyncio.run(researcher_agent.ainvoke({"researcher_messages": [HumanMessage(content=f"{research_brief}.")]}))
     print(result['researcher_messages'])
\ No newline at end of file
@@ -11,11 +11,14 @@ The system orchestrates the complete research workflow from initial user
 input through final report delivery.
 """
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, START, END
 
 from lawdeepresearch.utils import get_today_str
-from lawdeepresearch.prompts import final_report_generation_prompt
+from lawdeepresearch.prompts import (
+    final_report_generation_system_prompt,
+    render_final_report_generation_human_message,
+)
 from lawdeepresearch.state_scope import AgentState, AgentInputState
 from lawdeepresearch.research_agent_scope import (
     clarify_with_user,
@@ -29,19 +32,9 @@ from lawdeepresearch.multi_agent_supervisor import supervisor_agent
 from langchain.chat_models import init_chat_model
 
 # writer_model = init_chat_model(model="openai:gpt-4.1", max_tokens=32000) # model="anthropic:claude-sonnet-4-20250514", max_tokens=64000
-import os
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-
-load_dotenv()
-API_KEY = os.getenv("GOOGLE_API_KEY")
-writer_model = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    api_key=API_KEY,
-    temperature=0,
-    convert_system_message_to_human=True,
-    max_output_tokens=32000,
-)
+from lawdeepresearch.llm import get_model
+
+writer_model = get_model(max_output_tokens=32000)
 
 # ===== FINAL REPORT GENERATION =====
 
@@ -59,19 +52,28 @@ async def final_report_generation(state: AgentState):
 
     findings = "\n".join(notes)
 
-    final_report_prompt = final_report_generation_prompt.format(
+    # 고정된 작성 지침은 시스템 메시지로, 브리핑과 조사 결과는 짧은 사용자 메시지로 보냅니다.
+    final_report_prompt = render_final_report_generation_human_message(
         research_brief=state.get("research_brief", ""),
         findings=findings,
         date=get_today_str(),
     )
 
-    final_report = await writer_model.ainvoke(
-        [HumanMessage(content=final_report_prompt)]
-    )
+    # 보고서는 토큰 단위로 스트리밍해, stream_mode="messages" 구독자가 생성되는 즉시 받아 보도록 합니다.
+    report_parts = []
+    async for chunk in writer_model.astream(
+        [
+            SystemMessage(content=final_report_generation_system_prompt),
+            HumanMessage(content=final_report_prompt),
+        ]
+    ):
+        if isinstance(chunk.content, str):
+            report_parts.append(chunk.content)
+    final_report = "".join(report_parts)
 
     return {
-        "final_report": final_report.content,
-        "messages": ["Here is the final report: " + final_report.content],
+        "final_report": final_report,
+        "messages": ["Here is the final report: " + final_report],
     }
 
 
@@ -88,7 +90,7 @@ deep_researcher_builder.add_node("final_report_generation", final_report_generat
 
 # Add workflow edges
 deep_researcher_builder.add_edge(START, "clarify_with_user")
-deep_researcher_builder.add_edge("process_documents", "plan_legal_review")
+# process_documents routes itself (Command) to plan_legal_review, or to END when no document parsed
 deep_researcher_builder.add_edge("plan_legal_review", "supervisor_subgraph")
 deep_researcher_builder.add_edge("supervisor_subgraph", "final_report_generation")
 deep_researcher_builder.add_edge("final_report_generation", END)
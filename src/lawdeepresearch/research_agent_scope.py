@@ -12,22 +12,57 @@ This module implements the scoping phase of the legal review workflow, where we:
 3. 대화 내용과 분석된 데이터를 바탕으로 상세하고 구조화된 검토 브리핑을 생성합니다.
 """
 
+import asyncio
+import hashlib
+import html
 import json
-import requests
-from datetime import datetime
+import logging
+import mimetypes
+import os
+import re
+from html.parser import HTMLParser
+from io import BytesIO
+from pathlib import Path
 from typing import Literal
+import httpx
+import orjson
+from cachetools import LRUCache
 from dotenv import load_dotenv
 
+# pypdf가 설치되어 있으면 여러 페이지짜리 PDF를 페이지 단위로 나누어 OCR합니다.
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    PdfReader = PdfWriter = None
+
+# diskcache가 설치되어 있으면 문서 분석 결과를 프로세스 재시작 후에도 재사용합니다.
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
 # Upstage 모델과 LangChain의 핵심 컴포넌트를 가져옵니다.
 # from langchain_upstage import ChatUpstage
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage, AIMessage, get_buffer_string
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, get_buffer_string
 
 # LangGraph 관련 컴포넌트를 가져옵니다.
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import Command
 
-from lawdeepresearch.prompts import clarify_user_instruction, plan_legal_review_prompt
+from lawdeepresearch.llm import get_model
+from lawdeepresearch.prompts import (
+    CLARIFICATION_QUESTION,
+    DOCUMENT_PROCESSING_FAILED_MESSAGE,
+    document_analysis_system_prompt,
+    render_document_analysis_human_message,
+    render_verification,
+    render_clarify_user_instruction,
+    build_plan_prompt,
+    render_summarize_conversation_prompt,
+)
+
+# 날짜 문자열은 다른 에이전트와 같은 함수(하루 한 번만 생성)를 사용합니다.
+from lawdeepresearch.utils import get_today_str
 
 # 우리 프로젝트에 맞게 수정한 State와 스키마를 가져옵니다.
 # (프로젝트 이름은 'lawdeepresearch'로 가정)
@@ -35,16 +70,11 @@ from lawdeepresearch.state_scope import (
     AgentState,
     AgentInputState,
     ClarifyWithUser,
+    DocumentAnalysisBatch,
     ResearchQuestion,
 )
 
-# ===== 유틸리티 함수 =====
-
-
-def get_today_str() -> str:
-    """Get current date in a human-readable format. / 현재 날짜를 사람이 읽기 쉬운 형태로 반환합니다."""
-    return datetime.now().strftime("%a %b %#d, %Y")  # 윈도우
-
+logger = logging.getLogger(__name__)
 
 # ===== 설정(CONFIGURATION) =====
 
@@ -53,25 +83,183 @@ def get_today_str() -> str:
 # model = ChatUpstage(model_name="solar-1-mini-chat", temperature=0)
 
 
-# 최신 모델인 Gemini 1.5 Flash를 사용합니다. 성능이 더 중요하다면 "gemini-1.5-pro-latest"를 사용할 수 있습니다.
-# convert_system_message_to_human=True는 Gemini 모델과의 호환성을 위한 중요한 옵션입니다.
-import os
-
+# 모든 에이전트가 공유하는 Gemini 모델을 사용합니다. (lawdeepresearch.llm 참고)
 load_dotenv()
-API_KEY = os.getenv("GOOGLE_API_KEY")
-model = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
-    api_key=API_KEY,
-    temperature=0,
-    convert_system_message_to_human=True,
+model = get_model()
+
+# 명확화 판단은 짧은 고정 문구의 JSON만 출력하므로 출력 토큰 상한을 낮게 잡습니다.
+clarify_model = get_model(max_output_tokens=1024)
+
+# 오래된 대화를 요약하는 데에는 짧은 출력이면 충분합니다.
+# gemini-2.5-flash는 사고(thinking) 토큰도 출력 상한에 포함하므로, 사고를 꺼서 500토큰을 모두 요약에 씁니다.
+summary_model = get_model(max_output_tokens=500, thinking_budget=0)
+
+# 프롬프트에 원문 그대로 넣을 최근 메시지 수
+RECENT_MESSAGE_COUNT = 4
+
+# 구조화 출력은 JSON 모드에 dict 스키마를 넘겨, 응답을 Pydantic 객체 대신 dict로 바로 받습니다.
+CLARIFY_WITH_USER_SCHEMA = ClarifyWithUser.model_json_schema()
+RESEARCH_QUESTION_SCHEMA = ResearchQuestion.model_json_schema()
+DOCUMENT_ANALYSIS_SCHEMA = DocumentAnalysisBatch.model_json_schema(by_alias=True)
+
+# 구조화 출력 모델은 호출마다 스키마를 다시 변환하지 않도록 모듈 로드 시 한 번만 만듭니다.
+# ClarifyWithUser / ResearchQuestion 스키마에 맞춘 명확화 판단과 검토 브리핑
+clarify_structured_model = clarify_model.with_structured_output(
+    CLARIFY_WITH_USER_SCHEMA, method="json_mode"
 )
+plan_structured_model = model.with_structured_output(
+    RESEARCH_QUESTION_SCHEMA, method="json_mode"
+)
+# 문서 분석 결과를 스키마에 맞는 dict로 받아, 코드 펜스 제거나 json.loads가 필요 없도록 합니다.
+document_model = model.with_structured_output(DOCUMENT_ANALYSIS_SCHEMA, method="json_mode")
 
 upstage_api_key = os.getenv("UPSTAGE_API_KEY")
+# OCR HTML에서 연속된 공백을 하나로 접을 때 사용합니다.
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Upstage Document AI에 동시에 보낼 수 있는 최대 요청 수
+UPSTAGE_MAX_CONCURRENCY = 8
+
+# 실행이 바뀌어도 TLS 세션을 재사용하도록 Upstage 요청은 HTTP/2 클라이언트 하나를 공유합니다.
+upstage_client = httpx.AsyncClient(
+    http2=True,
+    timeout=120,
+    limits=httpx.Limits(max_keepalive_connections=UPSTAGE_MAX_CONCURRENCY),
+)
+
+# 이 페이지 수 이상인 PDF는 페이지별로 나누어 동시에 OCR합니다.
+PDF_SPLIT_MIN_PAGES = 4
+
+# 파일 내용의 SHA-256을 키로 문서 분석 결과(JSON)를 저장합니다.
+# 같은 파일을 다른 이름으로 다시 올려도 OCR과 LLM 호출 없이 결과를 재사용합니다.
+PARSED_DOCUMENT_CACHE_DIR = ".parsed_docs_cache"
+if diskcache is not None:
+    parsed_document_cache = diskcache.Cache(PARSED_DOCUMENT_CACHE_DIR)
+else:
+    parsed_document_cache = LRUCache(maxsize=64)
+
+
+def file_sha256(path: str) -> str:
+    """파일 내용을 조각 단위로 읽어 SHA-256 해시(16진수 문자열)를 계산합니다."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class _OcrHtmlCleaner(HTMLParser):
+    """Upstage OCR HTML에서 요약에 필요 없는 스타일·좌표 속성과 style/script 내용을 걷어냅니다."""
+
+    KEPT_ATTRIBUTES = frozenset(("colspan", "rowspan"))
+    DROPPED_TAGS = frozenset(("style", "script"))
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.DROPPED_TAGS:
+            self.skip_depth += 1
+            return
+        if self.skip_depth:
+            return
+        kept = "".join(
+            f' {name}="{value}"' for name, value in attrs if name in self.KEPT_ATTRIBUTES
+        )
+        self.parts.append(f"<{tag}{kept}>")
+
+    def handle_endtag(self, tag):
+        if tag in self.DROPPED_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+            return
+        if not self.skip_depth:
+            self.parts.append(f"</{tag}>")
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(html.escape(data, quote=False))
+
+
+def clean_ocr_html(raw_html: str) -> str:
+    """OCR HTML을 LLM 입력용으로 줄입니다. 표 구조(colspan/rowspan)와 본문만 남기고 공백을 접습니다."""
+    cleaner = _OcrHtmlCleaner()
+    cleaner.feed(raw_html)
+    cleaner.close()
+    return _WHITESPACE_RE.sub(" ", "".join(cleaner.parts)).strip()
+
+
+def store_parsed_documents(entries: dict) -> None:
+    """해시별 문서 분석 결과를 캐시에 저장합니다."""
+    for digest, parsed_json in entries.items():
+        parsed_document_cache[digest] = parsed_json
+
+
+def split_pdf_pages(path: str) -> list[bytes]:
+    """PDF를 한 페이지짜리 PDF(bytes)들로 나눕니다. 페이지 수가 적으면 나누지 않고 빈 리스트를 반환합니다."""
+    reader = PdfReader(path)
+    if len(reader.pages) < PDF_SPLIT_MIN_PAGES:
+        return []
+    pages = []
+    for page in reader.pages:
+        writer = PdfWriter()
+        writer.add_page(page)
+        buffer = BytesIO()
+        writer.write(buffer)
+        pages.append(buffer.getvalue())
+    return pages
+
+
+async def format_conversation(state: AgentState) -> tuple[str, dict]:
+    """
+    Render the conversation for a prompt as a summary of older turns plus the recent turns verbatim.
+
+    최근 메시지만 원문 그대로 두고, 그 이전 대화는 짧은 요약으로 대체해 프롬프트 길이를 일정하게 유지합니다.
+    요약은 상태(history_summary)에 저장해 두고, 창 밖으로 새로 밀려난 메시지가 있을 때만
+    기존 요약과 그 메시지들을 합쳐 다시 요약하므로, 턴마다 드는 요약 비용이 대화 길이와 무관합니다.
+
+    Returns:
+        프롬프트에 넣을 대화 문자열과, 노드가 함께 반환해야 하는 상태 업데이트
+    """
+    messages = state["messages"]
+    if len(messages) <= RECENT_MESSAGE_COUNT:
+        return get_buffer_string(messages), {}
+
+    older_count = len(messages) - RECENT_MESSAGE_COUNT
+    history_summary = state.get("history_summary", "")
+    buffered_count = state.get("messages_buffered_count", 0)
+    update = {}
+    if older_count > buffered_count:
+        summary = await summary_model.ainvoke(
+            [
+                HumanMessage(
+                    content=render_summarize_conversation_prompt(
+                        previous_summary=history_summary,
+                        messages=get_buffer_string(messages[buffered_count:older_count]),
+                    )
+                )
+            ]
+        )
+        new_summary = summary.text().strip()
+        # 요약이 비어 있으면 상태를 갱신하지 않아, 다음 턴에 같은 메시지들을 다시 요약합니다.
+        if new_summary:
+            history_summary = new_summary
+            buffered_count = older_count
+            update = {
+                "history_summary": history_summary,
+                "messages_buffered_count": older_count,
+            }
+
+    # 아직 요약에 들어가지 못한 메시지는 원문 그대로 함께 보내 이번 턴에서도 빠지지 않게 합니다.
+    recent = messages[min(buffered_count, older_count):]
+    conversation = (
+        f"<Summary>\n{history_summary}\n</Summary>\n"
+        f"<RecentTurns>\n{get_buffer_string(recent)}\n</RecentTurns>"
+    )
+    return conversation, update
 
 # ===== 워크플로우 노드(NODES) =====
 
 
-def clarify_with_user(
+async def clarify_with_user(
     state: AgentState,
 ) -> Command[Literal["process_documents", "__end__"]]:
     """
@@ -81,18 +269,20 @@ def clarify_with_user(
     사용자의 요청에 분석을 시작하기에 충분한 정보가 있는지 판단합니다.
     문서 처리 단계로 넘어가거나, 명확한 질문과 함께 종료됩니다.
     """
-    # LLM이 ClarifyWithUser 스키마에 맞춰 구조화된 답변을 생성하도록 설정합니다.
-    structured_output_model = model.with_structured_output(ClarifyWithUser)
-
     # 이전에 정의한 프롬프트를 사용하여 LLM을 호출합니다.
     # clarify_user_instruction 프롬프트 내용을 여기에 직접 넣거나 파일에서 불러옵니다.
     # clarify_prompt = "..." # 여기에 clarify_user_instruction 프롬프트 내용을 채워주세요.
-    print(f"   전달된 데이터: {state['document_paths']}")
-    response = structured_output_model.invoke(
+    # 같은 스레드에서 이미 역할과 문서가 확인되었다면 다시 판단하지 않고 바로 문서 처리로 넘어갑니다.
+    if state.get("clarification_complete"):
+        return Command(goto="process_documents")
+
+    logger.debug("   전달된 데이터: %s", state["document_paths"])
+    conversation, buffer_update = await format_conversation(state)
+    response = await clarify_structured_model.ainvoke(
         [
             HumanMessage(
-                content=clarify_user_instruction.format(
-                    messages=get_buffer_string(messages=state["messages"]),
+                content=render_clarify_user_instruction(
+                    messages=conversation,
                     document_paths=state.get("document_paths", []),
                     date=get_today_str(),
                 )
@@ -100,15 +290,20 @@ def clarify_with_user(
         ]
     )
 
-    # LLM의 판단에 따라 다음 단계를 결정합니다.
-    if response.need_clarification:
+    # LLM의 판단에 따라 다음 단계를 결정합니다. 역할을 알 수 없으면 진행할 수 없으므로 다시 묻습니다.
+    if response["need_clarification"] or not response.get("role"):
         return Command(
-            goto=END, update={"messages": [AIMessage(content=response.question)]}
+            goto=END,
+            update={"messages": [AIMessage(content=CLARIFICATION_QUESTION)], **buffer_update},
         )
     else:
         return Command(
             goto="process_documents",
-            update={"messages": [AIMessage(content=response.verification)]},
+            update={
+                "messages": [AIMessage(content=render_verification(role=response["role"]))],
+                "clarification_complete": True,
+                **buffer_update,
+            },
         )
 
 
@@ -155,142 +350,171 @@ def clarify_with_user(
 #     return {"parsed_data": all_parsed_data}
 
 
-def process_documents(state: AgentState) -> dict:
-    """상태에 저장된 문서 경로를 바탕으로 가상의 문서 분석(파싱)을 수행합니다."""
+async def process_documents(
+    state: AgentState,
+) -> Command[Literal["plan_legal_review", "__end__"]]:
+    """상태에 저장된 문서 경로를 바탕으로 문서 분석(파싱)을 수행합니다.
+
+    분석에 성공한 문서가 하나도 없으면 빈 데이터로 계획을 세우지 않고, 사용자에게 다시 업로드를 요청하며 종료합니다.
+    """
     document_paths = state.get("document_paths", [])
     if not document_paths:
-        print("오류: 처리할 문서가 없습니다.")
-        return {}
+        logger.error("오류: 처리할 문서가 없습니다.")
+        return Command(goto="plan_legal_review")
 
-    all_parsed_data = []
-    print("\n--- 문서 처리 시작 ---")
-
-    document_analysis_prompt_template = """
-
-    You are a highly skilled legal expert AI specializing in the analysis of South Korean real estate documents.
-    Your mission is to analyze the HTML content of a document extracted via OCR, summarize its key information, and, most importantly, clearly identify potential risks or points of caution for the user.
-
-    Review the [Document HTML Content] below and perform the following tasks in order:
-    1. Identify Document Type: Determine if the document is a '주택임대차계약서' (Housing Lease Agreement) or a '등기부등본' (Real Estate Register).
-
-    2. Extract and Summarize Key Information: Based on the identified document type, extract and summarize all relevant information precisely as shown in the [Output Format] examples below. The final output must be a single JSON object.
-    
-    3. Analyze Risk Factors (for Lease Agreements only): If the document is a '주택임대차계약서', analyze its contents for any unusual clauses, provisions that could be disadvantageous to the tenant, or obvious errors (e.g., mismatched amounts). Describe these findings clearly in the 주의사항 (warnings) field. If no risks are found, return an empty list [].
-
-    [Document HTML Content]
-    {html_content}
-
-    [Output Format]
-    You must strictly adhere to the JSON structure defined below. Return only the raw JSON object without any markdown formatting (like ```json ... ```).
-
-    **'주택 임대차 계약서'인 경우:**
-    ```json
-    {{
-    "document_type": "주택 임대차 계약서",
-    "summary": {{
-        "기본 정보": {{
-        "임대인": "추출된 임대인 이름",
-        "임차인": "추출된 임차인 이름",
-        "부동산 주소": "추출된 전체 주소",
-        "임차할 부분": "추출된 임차 범위"
-        }},
-        "보증금 및 계약 기간": {{
-        "총 보증금": "추출된 총 보증금 (숫자와 단위 포함)",
-        "계약금": "추출된 계약금",
-        "중도금": "추출된 중도금 (지급일 포함)",
-        "잔금": "추출된 잔금 (지급일 포함)",
-        "계약 기간": "YYYY-MM-DD ~ YYYY-MM-DD (총 O년) 형식",
-        "주의사항": [
-            "분석된 위험 요소 또는 이례적 조항에 대한 설명 1",
-            "분석된 위험 요소 또는 이례적 조항에 대한 설명 2"
-        ]
-        }},
-        "주요 특약사항": [
-        {{
-            "조항": "특약사항 제목 요약",
-            "내용": "특약사항 전체 내용"
-        }}
-        ],
-        "기타 확인사항": {{
-        "집주인 권리관계": "미납 세금 및 선순위 권리자 유무",
-        "중개보수": "추출된 중개보수 정보",
-        "원상복구의무 범위": "추출된 원상복구 관련 내용"
-        }}
-    }}
-    }}
-
-    **'등기부등본'인 경우:**
-    {{
-    "document_type": "등기부등본",
-    "summary": {{
-        "기본 정보": {{
-        "소재지번": "추출된 주소",
-        "부동산 종류": "예: 토지, 건물, 집합건물"
-        }},
-        "소유권 현황 (갑구)": {{
-        "현재 소유자": {{
-            "성명": "추출된 현재 소유자 이름",
-            "주소": "추출된 소유자 주소",
-            "등기원인": "예: 매매, 상속 등"
-        }},
-        "주의사항(압류/가압류 등)": [
-            "갑구에서 발견된 소유권 제한 관련 내용 요약 1",
-            "갑구에서 발견된 소유권 제한 관련 내용 요약 2"
-        ]
-        }},
-        "소유권 외 권리 현황 (을구)": {{
-        "근저당권 및 기타 권리": [
-            {{
-            "권리 종류": "예: 근저당권",
-            "채권최고액": "추출된 금액",
-            "채권자": "추출된 채권자(은행 등)",
-            "설정일자": "YYYY-MM-DD"
-            }}
-        ],
-        "주의사항": "을구가 깨끗한지, 아니면 과도한 대출 또는 빛이 있는지에 대한 종합적인 분석 의견"
-        }}
-    }}
-    }}
-    """
+    logger.info("--- 문서 처리 시작 ---")
 
-    for path in document_paths:
-        print(f"문서 처리 중: '{path}'...")
+    url = "https://api.upstage.ai/v1/document-digitization"
+    headers = {"Authorization": f"Bearer {upstage_api_key}"}
+    data = {"ocr": "force", "model": "document-parse"}
+    # Upstage 요청 한도를 넘지 않도록 동시에 진행하는 업로드 수를 제한합니다.
+    semaphore = asyncio.Semaphore(UPSTAGE_MAX_CONCURRENCY)
 
-        filename = path
+    async def upload_to_upstage(client: httpx.AsyncClient, document: tuple) -> str:
+        """파일 하나(또는 PDF 한 페이지)를 Upstage로 보내 OCR 결과 HTML을 받습니다.
 
-        url = "https://api.upstage.ai/v1/document-digitization"
-        headers = {"Authorization": f"Bearer {upstage_api_key}"}
-        files = {"document": open(filename, "rb")}
-        data = {"ocr": "force", "model": "document-parse"}
-        response = requests.post(url, headers=headers, files=files, data=data)
-        upstage_result = response.json()
-        html_from_api = upstage_result.get("content", {}).get("html", "")
+        인증 실패(401), 요청 한도 초과(429), 서버 오류(5xx) 등은 빈 HTML로 넘기지 않고 예외로 올립니다.
+        """
+        async with semaphore:
+            response = await client.post(
+                url, headers=headers, files={"document": document}, data=data
+            )
+        response.raise_for_status()
+        # OCR 응답은 HTML 전체를 담고 있어 크므로 orjson으로 파싱합니다.
+        upstage_result = orjson.loads(response.content)
+        return upstage_result.get("content", {}).get("html", "")
+
+    async def digitize_document(client: httpx.AsyncClient, path: str) -> dict:
+        """문서 하나를 Upstage로 디지털화합니다. 이전에 분석한 문서라면 캐시된 결과를 돌려줍니다."""
+        logger.info("문서 처리 중: '%s'...", path)
+
+        # 해시 계산은 파일을 조각 단위로 읽으므로 큰 스캔본도 메모리에 통째로 올리지 않습니다.
+        digest = await asyncio.to_thread(file_sha256, path)
+        # diskcache 조회는 디스크(SQLite) I/O이므로 스레드에서 수행합니다.
+        cached = await asyncio.to_thread(parsed_document_cache.get, digest)
+        if cached is not None:
+            logger.info("'%s' 캐시된 분석 결과를 사용합니다.", path)
+            return {"digest": digest, "parsed": cached}
+
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        pages = []
+        if PdfReader is not None and content_type == "application/pdf":
+            pages = await asyncio.to_thread(split_pdf_pages, path)
+
+        if pages:
+            # 페이지가 많은 PDF는 페이지별로 동시에 OCR하고, 결과 HTML을 페이지 순서대로 잇습니다.
+            stem = Path(path).stem
+            page_htmls = await asyncio.gather(
+                *(
+                    upload_to_upstage(
+                        client, (f"{stem}_p{number}.pdf", page, content_type)
+                    )
+                    for number, page in enumerate(pages, start=1)
+                )
+            )
+            raw_html = "\n".join(page_htmls)
+            # 일부 페이지의 OCR 결과가 비어 있으면 분석은 하되 캐시에는 남기지 않습니다.
+            cacheable = all(page_htmls)
+        else:
+            # 파일 읽기는 스레드에서 수행해, 큰 스캔본을 읽는 동안에도 이벤트 루프를 막지 않습니다.
+            document = await asyncio.to_thread(Path(path).read_bytes)
+            raw_html = await upload_to_upstage(
+                client, (Path(path).name, document, content_type)
+            )
+            cacheable = bool(raw_html)
+
+        # 스타일과 좌표 속성을 걷어내 LLM 입력 토큰을 줄입니다.
+        cleaned_html = clean_ocr_html(raw_html)
+        if not cleaned_html:
+            raise ValueError(f"'{path}'의 OCR 결과가 비어 있습니다.")
+        return {"digest": digest, "html": cleaned_html, "cacheable": cacheable}
+
+    # OCR은 모든 문서에 대해 동시에 진행합니다. gather는 입력 순서대로 결과를 돌려줍니다.
+    results = await asyncio.gather(
+        *(digitize_document(upstage_client, path) for path in document_paths),
+        return_exceptions=True,
+    )
 
-        model_output = model.invoke(
+    # 한 문서의 실패가 나머지 문서의 결과까지 버리지 않도록 실패한 문서만 건너뜁니다.
+    digitized = {}
+    for path, result in zip(document_paths, results):
+        if isinstance(result, Exception):
+            logger.error("오류: '%s' 처리 실패", path, exc_info=result)
+            continue
+        digitized[path] = result
+
+    async def analyze_documents(htmls: dict[int, str]) -> dict:
+        """문서 HTML들(id -> HTML)을 LLM 호출 한 번으로 분석해 id -> 분석 결과를 돌려줍니다."""
+        documents_json = orjson.dumps(
+            [{"id": index, "html": html_text} for index, html_text in htmls.items()]
+        ).decode()
+        # 고정 지시문을 앞에, 문서마다 달라지는 HTML을 맨 뒤에 두어 프롬프트 접두부가 캐시되도록 합니다.
+        response = await document_model.ainvoke(
             [
+                SystemMessage(content=document_analysis_system_prompt),
                 HumanMessage(
-                    content=document_analysis_prompt_template.format(
-                        html_content=html_from_api
+                    content=render_document_analysis_human_message(
+                        documents_json=documents_json
                     )
-                )
+                ),
             ]
         )
+        return {int(item["id"]): item["document"] for item in response["results"]}
+
+    # 캐시에 없는 문서들은 LLM 호출 한 번으로 함께 요약·분석해, 고정 지시문을 문서 수만큼 반복해 보내지 않습니다.
+    pending = [path for path, result in digitized.items() if "parsed" not in result]
+    if pending:
+        htmls = {index: digitized[path]["html"] for index, path in enumerate(pending)}
+        try:
+            parsed_by_id = await analyze_documents(htmls)
+        except Exception:
+            logger.exception("오류: 문서 일괄 분석 실패. 문서별로 다시 분석합니다.")
+            parsed_by_id = {}
+
+        # 일괄 호출이 실패했거나 결과가 빠진 문서는 문서마다 따로 분석해, 한 문서의 문제가 나머지 문서의 결과까지 버리지 않게 합니다.
+        missing = [index for index in htmls if index not in parsed_by_id]
+        if missing:
+            retries = await asyncio.gather(
+                *(analyze_documents({index: htmls[index]}) for index in missing),
+                return_exceptions=True,
+            )
+            for index, retry in zip(missing, retries):
+                if isinstance(retry, Exception):
+                    logger.error("오류: '%s' 문서 분석 실패", pending[index], exc_info=retry)
+                else:
+                    parsed_by_id.update(retry)
+
+        new_entries = {}
+        for index, path in enumerate(pending):
+            parsed_json = parsed_by_id.get(index)
+            if parsed_json is None:
+                logger.error("오류: '%s'의 분석 결과가 없습니다.", path)
+                del digitized[path]
+                continue
+            # OCR이 완전히 성공한 문서만 캐시해, 실패한 결과가 같은 파일에 영구히 남지 않게 합니다.
+            if digitized[path]["cacheable"]:
+                new_entries[digitized[path]["digest"]] = parsed_json
+            digitized[path]["parsed"] = parsed_json
+        # 캐시 쓰기도 디스크 I/O이므로 한 번에 모아 스레드에서 수행합니다.
+        await asyncio.to_thread(store_parsed_documents, new_entries)
 
-        model_output_text = model_output.content
-        json_str = model_output_text.strip().replace("```json", "").replace("```", "")
-
-        model_output_text
-        parsed_json = json.loads(json_str)
-
+    all_parsed_data = []
+    for path, result in digitized.items():
         # 최종 결과물에 파일 이름 추가
-        final_output = {"file_name": path, **parsed_json}
-
-        print(f"'{path}' 처리 완료.")
+        final_output = {"file_name": path, **result["parsed"]}
+        logger.info("'%s' 처리 완료.", path)
+        logger.debug("%s", final_output)
         all_parsed_data.append(final_output)
-        print(final_output)
 
-    print("--- 모든 문서 처리 완료 ---\n")
-    return {"parsed_data": all_parsed_data}
+    logger.info("--- 모든 문서 처리 완료 ---")
+
+    # 분석된 문서가 하나도 없으면 빈 데이터로 검토를 진행하지 않고 사용자에게 알립니다.
+    if not all_parsed_data:
+        return Command(
+            goto=END,
+            update={"messages": [AIMessage(content=DOCUMENT_PROCESSING_FAILED_MESSAGE)]},
+        )
+    return Command(goto="plan_legal_review", update={"parsed_data": all_parsed_data})
 
 
 # if "contract" in path.lower():
@@ -327,21 +551,24 @@ def process_documents(state: AgentState) -> dict:
 # 워크플로우 파일의 write_research_brief 함수 수정
 
 
-def plan_legal_review(state: AgentState) -> dict:
-    # LLM이 LegalReviewBrief 스키마에 맞춰 구조화된 답변을 생성하도록 설정합니다.
-    structured_output_model = model.with_structured_output(ResearchQuestion)
+async def plan_legal_review(state: AgentState) -> dict:
+    conversation, buffer_update = await format_conversation(state)
 
-    prompt = plan_legal_review_prompt.format(
-        messages=get_buffer_string(state["messages"]),
+    # 같은 스레드에서 이미 계획을 한 번 세웠다면 예시 질의는 빼고 보냅니다.
+    prompt = build_plan_prompt(
+        include_fewshot=not state.get("plan_examples_shown", False),
+        messages=conversation,
         parsed_data=state.get("parsed_data", []),
         date=get_today_str(),
     )
 
-    response = structured_output_model.invoke([HumanMessage(content=prompt)])
+    response = await plan_structured_model.ainvoke([HumanMessage(content=prompt)])
 
     return {
-        "research_brief": response.dict(),
-        "supervisor_messages": [HumanMessage(content=f"{response.research_brief}.")],
+        "research_brief": response,
+        "supervisor_messages": [HumanMessage(content=f"{response['research_brief']}.")],
+        "plan_examples_shown": True,
+        **buffer_update,
     }
 
 
@@ -356,7 +583,6 @@ workflow.add_node("process_documents", process_documents)
 workflow.add_node("plan_legal_review", plan_legal_review)
 
 workflow.add_edge(START, "clarify_with_user")
-workflow.add_edge("process_documents", "plan_legal_review")
 workflow.add_edge("plan_legal_review", END)
 
 # 워크플로우를 컴파일하여 실행 가능한 객체로 만듭니다.
@@ -364,6 +590,8 @@ law_research_agent = workflow.compile()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
     from IPython.display import Image, display
     from langgraph.checkpoint.memory import InMemorySaver
 
@@ -377,7 +605,7 @@ if __name__ == "__main__":
     # with open("workflow_graph.png", "wb") as f:
     #     f.write(png_data)
 
-    print("✅ Graph saved to 'workflow_graph.png'. You can now open this file.")
+    logger.info("✅ Graph saved to 'workflow_graph.png'. You can now open this file.")
 
     from langchain_core.messages import HumanMessage
 
@@ -393,9 +621,9 @@ if __name__ == "__main__":
     # print(result2['messages'][-1].content)
     # print("-" * 50)
 
-    print("\n--- 실행 3: 모든 정보 제공됨 -> 전체 워크플로우 실행 ---")
+    logger.info("--- 실행 3: 모든 정보 제공됨 -> 전체 워크플로우 실행 ---")
     thread3 = {"configurable": {"thread_id": "thread-3"}}
-    final_result = scope.invoke(
+    final_result = asyncio.run(scope.ainvoke(
         {
             "messages": [
                 HumanMessage(
@@ -408,10 +636,12 @@ if __name__ == "__main__":
             ],
         },
         config=thread3,
-    )
+    ))
 
     # 최종 결과인 research_brief 출력
-    print("✅ 최종 검토 브리핑이 생성되었습니다:")
-    print(json.dumps(final_result.get("research_brief"), indent=2, ensure_ascii=False))
+    logger.info(
+        "✅ 최종 검토 브리핑이 생성되었습니다:\n%s",
+        json.dumps(final_result.get("research_brief"), indent=2, ensure_ascii=False),
+    )
 
-    print(final_result["messages"])
+    logger.info("%s", final_result["messages"])
@@ -28,6 +28,8 @@ class SupervisorState(TypedDict):
     research_brief: str
     # Processed and structured notes ready for final report generation
     notes: Annotated[list[str], operator.add] = []
+    # Research findings collected so far, appended as each ToolMessage is created
+    notes_so_far: Annotated[list[str], operator.add] = []
     # Counter tracking the number of research iterations performed
     research_iterations: int = 0
     # Raw unprocessed research notes collected from sub-agent research
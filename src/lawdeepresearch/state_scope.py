@@ -1,5 +1,5 @@
 import operator
-from typing_extensions import Optional, Annotated, List, Sequence, Dict
+from typing_extensions import Optional, Annotated, List, Literal, Sequence, Dict, Union
 
 from langchain_core.messages import BaseMessage
 from langgraph.graph import MessagesState
@@ -31,6 +31,16 @@ class AgentState(MessagesState):
     # 이제 단순 문자열이 아닌 Dict(JSON) 형태로 저장됩니다.
     research_brief: Optional[Dict]
 
+    # 최근 메시지 창 밖으로 밀려난 이전 대화의 누적 요약과, 그중 몇 개의 메시지가 반영되었는지
+    history_summary: str = ""
+    messages_buffered_count: int = 0
+
+    # 이 스레드에서 검토 계획을 한 번 이상 성공적으로 세웠는지 여부 (이후 계획 프롬프트에서 예시를 생략)
+    plan_examples_shown: bool = False
+
+    # 명확화 단계를 이미 통과했는지 여부 (이후 턴에서는 명확화 LLM 호출을 건너뜀)
+    clarification_complete: bool = False
+
     # (이하 필드는 후속 연구/보고서 작성 단계를 위한 필드)
     # 조정을 위해 슈퍼바이저 에이전트와 주고받은 메시지
     supervisor_messages: Annotated[Sequence[BaseMessage], add_messages]
@@ -46,16 +56,14 @@ class AgentState(MessagesState):
 
 
 class ClarifyWithUser(BaseModel):
-    """Schema for user clarification decision and questions."""
+    """Schema for user clarification decision and the user's stated role."""
     
     need_clarification: bool = Field(
         description="사용자에게 명확화 질문을 해야 하는지 여부.",
     )
-    question: str = Field(
-        description="보고서의 범위를 명확히 하기 위해 사용자에게 물어볼 질문.",
-    )
-    verification: str = Field(
-        description="사용자가 필요한 정보를 제공한 후 리서치를 시작할 것임을 확인하는 메시지.",
+    role: Optional[Literal["임차인", "임대인"]] = Field(
+        default=None,
+        description="대화에서 사용자가 밝힌 역할. 밝히지 않았다면 null.",
     )
 
 class ResearchQuestion(BaseModel):
@@ -63,4 +71,117 @@ class ResearchQuestion(BaseModel):
     
     research_brief: str = Field(
         description="A research question that will be used to guide the research.",
-    )
\ No newline at end of file
+    )
+
+# ===== DOCUMENT ANALYSIS SCHEMAS =====
+# 문서 분석 결과의 JSON 키는 한국어이므로 각 필드는 alias로 실제 키 이름을 지정합니다.
+
+class LeaseBasicInfo(BaseModel):
+    """기본 정보 section of a lease agreement summary."""
+
+    lessor: str = Field(alias="임대인")
+    lessee: str = Field(alias="임차인")
+    address: str = Field(alias="부동산 주소")
+    leased_part: str = Field(alias="임차할 부분")
+
+class LeaseDepositAndTerm(BaseModel):
+    """보증금 및 계약 기간 section of a lease agreement summary."""
+
+    total_deposit: str = Field(alias="총 보증금", description="숫자와 단위 포함")
+    down_payment: str = Field(alias="계약금")
+    interim_payment: str = Field(alias="중도금", description="지급일 포함")
+    balance: str = Field(alias="잔금", description="지급일 포함")
+    term: str = Field(alias="계약 기간", description="YYYY-MM-DD ~ YYYY-MM-DD (총 O년) 형식")
+    warnings: List[str] = Field(alias="주의사항", description="위험 요소 또는 이례적 조항. 없으면 빈 리스트.")
+
+class SpecialClause(BaseModel):
+    """One 특약사항 entry of a lease agreement."""
+
+    title: str = Field(alias="조항", description="특약사항 제목 요약")
+    content: str = Field(alias="내용", description="특약사항 전체 내용")
+
+class LeaseOtherChecks(BaseModel):
+    """기타 확인사항 section of a lease agreement summary."""
+
+    landlord_rights: str = Field(alias="집주인 권리관계", description="미납 세금 및 선순위 권리자 유무")
+    brokerage_fee: str = Field(alias="중개보수")
+    restoration_scope: str = Field(alias="원상복구의무 범위")
+
+class LeaseAgreementSummary(BaseModel):
+    """Structured summary of a 주택 임대차 계약서."""
+
+    basic_info: LeaseBasicInfo = Field(alias="기본 정보")
+    deposit_and_term: LeaseDepositAndTerm = Field(alias="보증금 및 계약 기간")
+    special_clauses: List[SpecialClause] = Field(alias="주요 특약사항")
+    other_checks: LeaseOtherChecks = Field(alias="기타 확인사항")
+
+class LeaseAgreementDocument(BaseModel):
+    """Schema for a parsed 주택 임대차 계약서."""
+
+    document_type: Literal["주택 임대차 계약서"]
+    summary: LeaseAgreementSummary
+
+class RegisterBasicInfo(BaseModel):
+    """기본 정보 section of a property register summary."""
+
+    location: str = Field(alias="소재지번")
+    property_kind: str = Field(alias="부동산 종류", description="예: 토지, 건물, 집합건물")
+
+class RegisterOwner(BaseModel):
+    """Current owner entry in the 갑구 of a property register."""
+
+    name: str = Field(alias="성명")
+    address: str = Field(alias="주소")
+    cause: str = Field(alias="등기원인", description="예: 매매, 상속 등")
+
+class RegisterOwnership(BaseModel):
+    """소유권 현황 (갑구) section of a property register summary."""
+
+    current_owner: RegisterOwner = Field(alias="현재 소유자")
+    warnings: List[str] = Field(alias="주의사항(압류/가압류 등)")
+
+class RegisterRight(BaseModel):
+    """One 근저당권 or other right listed in the 을구."""
+
+    kind: str = Field(alias="권리 종류", description="예: 근저당권")
+    maximum_claim: str = Field(alias="채권최고액")
+    creditor: str = Field(alias="채권자")
+    registered_on: str = Field(alias="설정일자", description="YYYY-MM-DD")
+
+class RegisterOtherRights(BaseModel):
+    """소유권 외 권리 현황 (을구) section of a property register summary."""
+
+    rights: List[RegisterRight] = Field(alias="근저당권 및 기타 권리")
+    warnings: str = Field(alias="주의사항", description="을구에 과도한 대출이나 빚이 있는지에 대한 종합 분석 의견")
+
+class PropertyRegisterSummary(BaseModel):
+    """Structured summary of a 등기부등본."""
+
+    basic_info: RegisterBasicInfo = Field(alias="기본 정보")
+    ownership: RegisterOwnership = Field(alias="소유권 현황 (갑구)")
+    other_rights: RegisterOtherRights = Field(alias="소유권 외 권리 현황 (을구)")
+
+class PropertyRegisterDocument(BaseModel):
+    """Schema for a parsed 등기부등본."""
+
+    document_type: Literal["등기부등본"]
+    summary: PropertyRegisterSummary
+
+# document_type 값으로 두 문서 스키마 중 하나를 고릅니다.
+DocumentSummary = Annotated[
+    Union[LeaseAgreementDocument, PropertyRegisterDocument],
+    Field(discriminator="document_type"),
+]
+
+class DocumentAnalysisResult(BaseModel):
+    """One analyzed document, matched to its input by id."""
+
+    id: int = Field(description="입력 문서 배열에서의 id")
+    document: DocumentSummary
+
+class DocumentAnalysisBatch(BaseModel):
+    """Schema for analyzing several documents in a single call."""
+
+    results: List[DocumentAnalysisResult] = Field(
+        description="입력된 문서마다 하나씩, 같은 id로 반환하는 분석 결과",
+    )
@@ -1,86 +1,140 @@
-from pathlib import Path
-from datetime import datetime
-from typing_extensions import Annotated, List, Literal
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import unicodedata
+from contextvars import ContextVar
+from datetime import date
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from typing_extensions import Annotated, Callable, List, Literal
 import os
 from dotenv import load_dotenv
+from cachetools import LRUCache
 
-from langchain.chat_models import init_chat_model 
-from langchain_core.messages import HumanMessage
-from langchain_core.runnables import RunnableConfig
+# Optional persistent tier for webpage summaries, so they survive restarts
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.tools import tool, InjectedToolArg
-from tavily import TavilyClient
-from langchain_google_genai import ChatGoogleGenerativeAI
+from tavily import AsyncTavilyClient
 
+from lawdeepresearch.llm import get_model
 from lawdeepresearch.state_research import Summary
-from lawdeepresearch.prompts import summarize_webpage_prompt
+from lawdeepresearch.prompts import summarize_webpage_system_prompt, render_summarize_webpage_human_message
 
-# ===== UTILITY FUNCTIONS =====
-def get_today_str() -> str:
-    """Get current date in a human-readable format. / 현재 날짜를 사람이 읽기 쉬운 형태로 반환합니다."""
-    return datetime.now().strftime("%a %b %#d, %Y") # 윈도우 
+logger = logging.getLogger(__name__)
 
-def get_current_dir() -> Path:
-    """Get the current directory of the module.
+# ===== UTILITY FUNCTIONS =====
+@lru_cache(maxsize=1)
+def _format_day(day: date) -> str:
+    # day.day instead of %#d (Windows) / %-d (POSIX), so no platform-specific flag is needed
+    return f"{day:%a %b} {day.day}, {day.year}"
 
-    This function is compatible with Jupyter notebooks and regular Python scripts.
+def get_today_str() -> str:
+    """Get current date in a human-readable format. / 현재 날짜를 사람이 읽기 쉬운 형태로 반환합니다.
 
-    Returns:
-        Path object representing the current directory
+    The string is built once per day and reused, which also keeps prompts
+    that embed it byte-identical for the whole day.
     """
-    try:
-        return Path(__file__).resolve().parent
-    except NameError:  # __file__ is not defined
-        return Path.cwd()
+    return _format_day(date.today())
 
 # ===== CONFIGURATION =====
 
 # summarization_model = init_chat_model(model="openai:gpt-4.1-mini")
-import os
 load_dotenv()
-API_KEY = os.getenv("GOOGLE_API_KEY")
-summarization_model = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash", 
-    api_key = API_KEY,
-    temperature=0,
-    convert_system_message_to_human=True 
-)
-tavily_client = TavilyClient()
+# Shared Gemini model, so summaries reuse the same client and connection pool as the agents.
+# Retries are handled by summarize_webpage_content under its own deadline, not by the SDK.
+summarization_model = get_model(max_retries=0)
+# Upper bound on page characters sent to the summarizer (override with MAX_WEBPAGE_CONTENT_CHARS)
+MAX_WEBPAGE_CONTENT_CHARS = int(os.getenv("MAX_WEBPAGE_CONTENT_CHARS", "20000"))
+
+# Deadline for one summarization request, and how many times a timed-out or
+# transiently failed request is retried (with jittered exponential backoff)
+SUMMARY_TIMEOUT_SECONDS = 45
+SUMMARY_MAX_RETRIES = 2
+# HTTP statuses worth retrying: rate limiting and server-side failures
+TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Webpage summaries keyed by SHA-256 of the raw page content
+SUMMARY_CACHE = LRUCache(maxsize=1024)
+SUMMARY_DISK_CACHE_DIR = ".webpage_summary_cache"
+summary_disk_cache = diskcache.Cache(SUMMARY_DISK_CACHE_DIR) if diskcache is not None else None
+
+# URL -> summary for the current research run, so a page returned again by a later
+# search tool call in the same run is not summarized twice (None outside a run)
+search_summary_registry: ContextVar[dict | None] = ContextVar("search_summary_registry", default=None)
+
+# One shared async client for every search tool
+tavily_client = AsyncTavilyClient()
+# Structured output model for summarization, bound once instead of per page
+structured_summarizer = summarization_model.with_structured_output(Summary)
+
+# Query parameters that only track the referrer; every other parameter is kept, since
+# law.go.kr and glaw.scourt.go.kr identify statutes and precedents by query string
+TRACKING_QUERY_PARAMS = frozenset({"fbclid", "gclid", "ref", "src"})
+
+# Line closing each source block in format_search_output
+SOURCE_SEPARATOR = "-" * 80 + "\n"
 
 # ===== SEARCH FUNCTIONS =====
 
-def tavily_search_multiple(
-    search_queries: List[str], 
-    max_results: int = 3, 
-    topic: Literal["general", "news", "finance"] = "general", 
-    include_raw_content: bool = True, 
-) -> List[dict]:
-    """Perform search using Tavily API for multiple queries.
+def truncate_webpage_content(webpage_content: str, max_chars: int | None = None) -> str:
+    """Bound a page to max_chars, keeping its head and tail.
+
+    The first three quarters of the budget go to the head, where the title and
+    main text usually are, and the rest to the tail, where pages often carry
+    dates, case numbers, and source details.
 
     Args:
-        search_queries: List of search queries to execute
-        max_results: Maximum number of results per query
-        topic: Topic filter for search results
-        include_raw_content: Whether to include raw webpage content
+        webpage_content: Raw webpage content
+        max_chars: Character budget; defaults to MAX_WEBPAGE_CONTENT_CHARS
 
     Returns:
-        List of search result dictionaries
+        The content unchanged if it fits, otherwise head + marker + tail
     """
-    
-    # Execute searches sequentially. Note: yon can use AsyncTavilyClient to parallelize this step.
-    search_docs = []
-    for query in search_queries:
-        result = tavily_client.search(
-            query,
-            max_results=max_results,
-            include_raw_content=include_raw_content,
-            topic=topic
-        )
-        search_docs.append(result)
-
-    return search_docs
-
-def summarize_webpage_content(webpage_content: str) -> str:
+    max_chars = max_chars or MAX_WEBPAGE_CONTENT_CHARS
+    if len(webpage_content) <= max_chars:
+        return webpage_content
+    head = max_chars * 3 // 4
+    tail = max_chars - head
+    return webpage_content[:head] + "\n...[TRUNCATED]...\n" + webpage_content[-tail:]
+
+def _is_transient_error(error: Exception) -> bool:
+    """Whether a failed summarization request is worth retrying."""
+    if isinstance(error, TimeoutError):
+        return True
+    # Google API errors carry the HTTP status as .code (or .status_code)
+    status = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return status in TRANSIENT_STATUS_CODES
+
+async def _invoke_summarizer(messages: list):
+    """Call the structured summarizer with a deadline and retries on transient errors.
+
+    Each attempt is bounded by SUMMARY_TIMEOUT_SECONDS, so one hung request
+    cannot stall the batch of summaries gathered alongside it.
+    """
+    for attempt in range(SUMMARY_MAX_RETRIES + 1):
+        try:
+            return await asyncio.wait_for(
+                structured_summarizer.ainvoke(messages),
+                timeout=SUMMARY_TIMEOUT_SECONDS,
+            )
+        except Exception as e:
+            if attempt == SUMMARY_MAX_RETRIES or not _is_transient_error(e):
+                raise
+            await asyncio.sleep(random.uniform(0.5, 1.5) * 2 ** attempt)
+
+async def summarize_webpage_content(webpage_content: str) -> str:
     """Summarize webpage content using the configured summarization model.
+
+    The request is ordered from most to least stable: the static system prompt,
+    then the date, then the page itself. Keep per-call content at the end so
+    the shared prefix stays cacheable across summaries.
     
     Args:
         webpage_content: Raw webpage content to summarize
@@ -88,14 +142,22 @@ def summarize_webpage_content(webpage_content: str) -> str:
     Returns:
         Formatted summary with key excerpts
     """
+    # Identical page bodies are summarized once: memory first, then the optional disk tier
+    content_hash = hashlib.sha256(webpage_content.encode("utf-8")).hexdigest()
+    cached = SUMMARY_CACHE.get(content_hash)
+    if cached is None and summary_disk_cache is not None:
+        cached = await asyncio.to_thread(summary_disk_cache.get, content_hash)
+        if cached is not None:
+            SUMMARY_CACHE[content_hash] = cached
+    if cached is not None:
+        return cached
+
     try:
-        # Set up structured output model for summarization
-        structured_model = summarization_model.with_structured_output(Summary)
-        
         # Generate summary
-        summary = structured_model.invoke([
-            HumanMessage(content=summarize_webpage_prompt.format(
-                webpage_content=webpage_content, 
+        summary = await _invoke_summarizer([
+            SystemMessage(content=summarize_webpage_system_prompt),
+            HumanMessage(content=render_summarize_webpage_human_message(
+                webpage_content=truncate_webpage_content(webpage_content), 
                 date=get_today_str()
             ))
         ])
@@ -105,34 +167,96 @@ def summarize_webpage_content(webpage_content: str) -> str:
             f"<summary>\n{summary.summary}\n</summary>\n\n"
             f"<key_excerpts>\n{summary.key_excerpts}\n</key_excerpts>"
         )
+
+        # Only successful summaries are cached; the truncation fallback below is not
+        SUMMARY_CACHE[content_hash] = formatted_summary
+        if summary_disk_cache is not None:
+            await asyncio.to_thread(summary_disk_cache.set, content_hash, formatted_summary)
         
         return formatted_summary
         
     except Exception as e:
-        print(f"Failed to summarize webpage: {str(e)}")
+        logger.warning("Failed to summarize webpage: %s", e)
         return webpage_content[:1000] + "..." if len(webpage_content) > 1000 else webpage_content
 
+def start_search_session() -> object:
+    """Give the current context a fresh URL -> summary registry.
+
+    Call at the start of a research run; tasks spawned afterwards (graph nodes,
+    tool calls) inherit the same registry.
+
+    Returns:
+        Token for search_summary_registry.reset() when the run ends
+    """
+    return search_summary_registry.set({})
+
+def normalize_url(url: str) -> str:
+    """Reduce a URL to the form used as its deduplication key.
+
+    Lowercases the scheme and host, drops the fragment, a trailing slash, and
+    tracking parameters (utm_* and TRACKING_QUERY_PARAMS). All other query
+    parameters are kept in their original order.
+    """
+    parts = urlsplit(url)
+    query = urlencode([
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_QUERY_PARAMS
+    ])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
+
+def _result_fingerprint(result: dict) -> bytes | None:
+    """Hash of a result's full content, to spot mirror pages; None when it has no content.
+
+    The whole body is hashed because statute and precedent pages often share a
+    title and a long boilerplate header and differ only further down.
+    """
+    content = result.get("raw_content") or result.get("content")
+    if not content:
+        return None
+    return hashlib.sha1(content.encode("utf-8")).digest()
+
 def deduplicate_search_results(search_results: List[dict]) -> dict:
-    """Deduplicate search results by URL to avoid processing duplicate content.
+    """Deduplicate search results to avoid processing duplicate content.
+
+    Results are first keyed by normalized URL, so variants of the same address
+    (trailing slash, tracking parameters, host case) collapse into one entry.
+    A second pass drops results whose full content matches an earlier one,
+    which catches the same page served under different URLs.
     
     Args:
         search_results: List of search result dictionaries
         
     Returns:
-        Dictionary mapping URLs to unique results
+        Dictionary mapping URLs to unique results, keyed by the first URL seen
     """
+    seen_urls = set()
+    seen_fingerprints = set()
     unique_results = {}
     
     for response in search_results:
         for result in response['results']:
-            url = result['url']
-            if url not in unique_results:
-                unique_results[url] = result
+            url_key = normalize_url(result['url'])
+            if url_key in seen_urls:
+                continue
+            seen_urls.add(url_key)
+            fingerprint = _result_fingerprint(result)
+            if fingerprint is not None:
+                if fingerprint in seen_fingerprints:
+                    continue
+                seen_fingerprints.add(fingerprint)
+            unique_results[result['url']] = result
     
     return unique_results
 
-def process_search_results(unique_results: dict) -> dict:
+async def process_search_results(unique_results: dict) -> dict:
     """Process search results by summarizing content where available.
+
+    All pages with raw content are summarized concurrently. Mirror sites often
+    serve the same body under different URLs, so pages are grouped by a hash of
+    their raw content and each distinct body is summarized only once. URLs
+    already summarized earlier in the research run are taken from the run's
+    registry instead of being summarized again.
     
     Args:
         unique_results: Dictionary of unique search results
@@ -140,23 +264,82 @@ def process_search_results(unique_results: dict) -> dict:
     Returns:
         Dictionary of processed results with summaries
     """
+    registry = search_summary_registry.get()
+    known = registry or {}
+
+    # Group URLs by raw content so identical bodies share one summarization call
+    urls_by_hash = {}
+    raw_by_hash = {}
+    for url, result in unique_results.items():
+        raw_content = result.get("raw_content")
+        if raw_content and url not in known:
+            content_hash = hashlib.sha256(raw_content.encode("utf-8")).digest()
+            urls_by_hash.setdefault(content_hash, []).append(url)
+            raw_by_hash.setdefault(content_hash, raw_content)
+
+    # Summarize raw content for better processing
+    summaries = await asyncio.gather(*(
+        summarize_webpage_content(raw_content)
+        for raw_content in raw_by_hash.values()
+    ))
+    summaries_by_url = {
+        url: summary
+        for content_hash, summary in zip(raw_by_hash, summaries)
+        for url in urls_by_hash[content_hash]
+    }
+    if registry is not None:
+        registry.update(summaries_by_url)
+
     summarized_results = {}
     
     for url, result in unique_results.items():
         # Use existing content if no raw content for summarization
-        if not result.get("raw_content"):
-            content = result['content']
-        else:
-            # Summarize raw content for better processing
-            content = summarize_webpage_content(result['raw_content'])
-        
         summarized_results[url] = {
             'title': result['title'],
-            'content': content
+            'content': summaries_by_url.get(url) or known.get(url, result['content'])
         }
     
     return summarized_results
 
+async def search_and_summarize(
+    search_queries: List[str],
+    result_filter: Callable[[dict], dict] | None = None,
+    **search_kwargs,
+) -> dict:
+    """Search several queries and summarize each response as soon as it lands.
+
+    Every query runs its own search -> filter -> dedup -> summarize chain, so
+    summarization of an early response overlaps with searches still in flight
+    instead of waiting for the slowest one. A URL returned by several queries is
+    summarized only by the response that claims it first.
+
+    Args:
+        search_queries: Search queries to execute
+        result_filter: Optional filter applied to each raw Tavily response
+        **search_kwargs: Extra Tavily search options, e.g. max_results or topic
+
+    Returns:
+        Dictionary of processed results with summaries, in query order
+    """
+    claimed_urls = set()
+
+    async def search_then_summarize(query: str) -> dict:
+        response = await tavily_client.search(query, include_raw_content=True, **search_kwargs)
+        if result_filter is not None:
+            response = result_filter(response)
+        unique_results = {
+            url: result
+            for url, result in deduplicate_search_results([response]).items()
+            if normalize_url(url) not in claimed_urls
+        }
+        claimed_urls.update(map(normalize_url, unique_results))
+        return await process_search_results(unique_results)
+
+    summarized_results = {}
+    for query_results in await asyncio.gather(*map(search_then_summarize, search_queries)):
+        summarized_results.update(query_results)
+    return summarized_results
+
 def format_search_output(summarized_results: dict) -> str:
     """Format search results into a well-structured string output.
     
@@ -169,26 +352,32 @@ def format_search_output(summarized_results: dict) -> str:
     if not summarized_results:
         return "No valid search results found. Please try different search queries or use a different search API."
     
-    formatted_output = "Search results: \n\n"
+    # Collect the pieces and join once instead of growing one string in the loop
+    parts = ["Search results: \n\n"]
     
     for i, (url, result) in enumerate(summarized_results.items(), 1):
-        formatted_output += f"\n\n--- SOURCE {i}: {result['title']} ---\n"
-        formatted_output += f"URL: {url}\n\n"
-        formatted_output += f"SUMMARY:\n{result['content']}\n\n"
-        formatted_output += "-" * 80 + "\n"
+        # One f-string per source; the separator is a precomputed constant
+        parts.append(
+            f"\n\n--- SOURCE {i}: {result['title']} ---\n"
+            f"URL: {url}\n\n"
+            f"SUMMARY:\n{result['content']}\n\n"
+            f"{SOURCE_SEPARATOR}"
+        )
     
-    return formatted_output
+    return "".join(parts)
 
 # ===== RESEARCH TOOLS =====
 
 @tool(parse_docstring=True)
-def tavily_search(
+async def tavily_search(
     query: str,
     max_results: Annotated[int, InjectedToolArg] = 3,
     topic: Annotated[Literal["general", "news"], InjectedToolArg] = "general",
 ) -> str:
     """Fetch results from Tavily search API with content summarization.
 
+    Takes exactly one query. For several independent queries, call this tool multiple times in parallel in the same turn.
+
     Args:
         query: A single search query to execute
         max_results: Maximum number of results to return
@@ -197,26 +386,33 @@ def tavily_search(
     Returns:
         Formatted string of search results with summaries
     """
-    # Execute search for single query
-    search_results = tavily_search_multiple(
+    # Search, deduplicate by URL, and summarize the pages
+    summarized_results = await search_and_summarize(
         [query],  # Convert single query to list for the internal function
         max_results=max_results,
         topic=topic,
-        include_raw_content=True,
     )
 
-    # Deduplicate results by URL to avoid processing duplicate content
-    unique_results = deduplicate_search_results(search_results)
-
-    # Process results with summarization
-    summarized_results = process_search_results(unique_results)
-
     # Format output for consumption
     return format_search_output(summarized_results)
 
 
 
 
+# verify_identity_assumptions results; only the mismatch message interpolates the names
+IDENTITY_MATCH_RESULT = (
+    "✅ **가정: 소유자 명의 일치.**\n"
+    "계약서상 임대인과 등기부등본상 소유자의 이름이 일치하는 것으로 확인됩니다. "
+    "이는 계약의 신뢰도를 높이는 긍정적인 요소입니다. "
+    "단, 최종적인 동일인물 확인은 계약 현장에서 신분증을 통해 반드시 대조해야 합니다."
+)
+IDENTITY_MISMATCH_TEMPLATE = (
+    "🚨 **치명적 위험: 소유자 명의 불일치.**\n"
+    "계약서상 임대인은 '{lessor_name}'이지만, 등기부등본상 실제 소유자는 '{owner_name}'입니다. "
+    "이는 대리 계약이거나, 최악의 경우 전세 사기일 수 있습니다. "
+    "위임장, 인감증명서 등 적법한 대리인임을 증명하는 서류를 즉시 확인해야 하며, 확인 불가 시 계약을 진행해서는 안 됩니다."
+)
+
 @tool(parse_docstring=True)
 def verify_identity_assumptions(lessor_name: str, owner_name: str) -> str:
     """
@@ -230,44 +426,45 @@ def verify_identity_assumptions(lessor_name: str, owner_name: str) -> str:
     Returns:
         A string with a clear statement about the name match and associated risks.
     """
-    print(f"--- 임대인-소유자 명의 비교: 임대인({lessor_name}), 소유자({owner_name}) ---")
+    # OCR output and model-extracted names can differ only in Unicode form (composed vs.
+    # decomposed Hangul) or surrounding whitespace, so compare normalized names
+    lessor_name = unicodedata.normalize("NFC", lessor_name.strip())
+    owner_name = unicodedata.normalize("NFC", owner_name.strip())
+    logger.debug("--- 임대인-소유자 명의 비교: 임대인(%s), 소유자(%s) ---", lessor_name, owner_name)
     
     if lessor_name == owner_name:
-        return (
-            "✅ **가정: 소유자 명의 일치.**\n"
-            "계약서상 임대인과 등기부등본상 소유자의 이름이 일치하는 것으로 확인됩니다. "
-            "이는 계약의 신뢰도를 높이는 긍정적인 요소입니다. "
-            "단, 최종적인 동일인물 확인은 계약 현장에서 신분증을 통해 반드시 대조해야 합니다."
-        )
-    else:
-        return (
-            "🚨 **치명적 위험: 소유자 명의 불일치.**\n"
-            f"계약서상 임대인은 '{lessor_name}'이지만, 등기부등본상 실제 소유자는 '{owner_name}'입니다. "
-            "이는 대리 계약이거나, 최악의 경우 전세 사기일 수 있습니다. "
-            "위임장, 인감증명서 등 적법한 대리인임을 증명하는 서류를 즉시 확인해야 하며, 확인 불가 시 계약을 진행해서는 안 됩니다."
-        )
+        return IDENTITY_MATCH_RESULT
+    return IDENTITY_MISMATCH_TEMPLATE.format(lessor_name=lessor_name, owner_name=owner_name)
+
+# URL fragments that mark non-content pages (downloads, login walls, script or error pages)
+IRRELEVANT_URL_PATTERNS = ("download", "login", "javascript", "error")
+# One case-insensitive alternation built from the tuple scans each URL once;
+# add new fragments to the tuple rather than editing the regex
+IRRELEVANT_URL_RE = re.compile("|".join(map(re.escape, IRRELEVANT_URL_PATTERNS)), re.IGNORECASE)
+# Titles containing this are notice/guide pages rather than statutes or precedents
+IRRELEVANT_TITLE_MARKER = "안내"
 
 def _filter_legal_search_results(results: dict) -> dict:
     """Filters out irrelevant URLs from legal search results."""
     filtered_results = {'results': []}
-    irrelevant_patterns = ['download', 'login', 'javascript', 'error']
     
     for result in results.get('results', []):
-        url = result.get('url', '').lower()
-        title = result.get('title', '').lower()
+        url = result.get('url', '')
+        title = result.get('title', '')
         
         # Check if any irrelevant pattern is in the URL or title
-        if not any(pattern in url for pattern in irrelevant_patterns) and '안내' not in title:
+        if not IRRELEVANT_URL_RE.search(url) and IRRELEVANT_TITLE_MARKER not in title:
             filtered_results['results'].append(result)
             
     return filtered_results
 
 
 @tool(parse_docstring=True)
-def statute_search(query: str) -> str:
+async def statute_search(query: str) -> str:
     """Searches for Korean statutes and laws exclusively from the National Law Information Center (law.go.kr).
 
     Use this tool to find the exact text of laws, articles, and regulations.
+    Takes exactly one query. For several independent queries, call this tool multiple times in parallel in the same turn.
 
     Args:
         query: The legal keyword or article number to search for (e.g., "주택임대차보호법 제3조").
@@ -277,25 +474,23 @@ def statute_search(query: str) -> str:
     """
     # Prepend the 'site:' operator to restrict the search to the authoritative source.
     search_query = f"{query} site:law.go.kr"
-    print(f"--- 법령 검색 실행: {search_query} ---")
+    logger.debug("--- 법령 검색 실행: %s ---", search_query)
     
-    # 1. Tavily로 검색 실행
-    raw_results = tavily_client.search(search_query, include_raw_content=True, max_results=5)
-    
-    # 2. (NEW) 의미 없는 URL 필터링
-    filtered_results = _filter_legal_search_results(raw_results)
-    
-    # 3. 기존 파이프라인 재사용
-    unique_results = deduplicate_search_results([filtered_results]) # Note: Wrap in a list
-    summarized_results = process_search_results(unique_results)
+    # 1. Tavily로 검색 실행 → 2. 의미 없는 URL 필터링 → 3. 중복 제거 후 요약
+    summarized_results = await search_and_summarize(
+        [search_query],
+        result_filter=_filter_legal_search_results,
+        max_results=5,
+    )
     
     return format_search_output(summarized_results)
 
 @tool(parse_docstring=True)
-def case_law_search(query: str) -> str:
+async def case_law_search(query: str) -> str:
     """Searches for South Korean court precedents exclusively from the Supreme Court legal database (glaw.scourt.go.kr).
 
     Use this tool to find court cases and legal precedents related to a specific situation.
+    Takes exactly one query. For several independent queries, call this tool multiple times in parallel in the same turn.
 
     Args:
         query: The legal situation or keyword to search for precedents (e.g., "전세보증금 미반환 대항력 판례").
@@ -305,17 +500,14 @@ def case_law_search(query: str) -> str:
     """
     # Prepend the 'site:' operator to restrict the search.
     search_query = f"{query} site:glaw.scourt.go.kr"
-    print(f"--- 판례 검색 실행: {search_query} ---")
-    
-    # 1. Tavily로 검색 실행 (더 많은 결과를 가져와서 필터링)
-    raw_results = tavily_client.search(search_query, include_raw_content=True, max_results=5)
+    logger.debug("--- 판례 검색 실행: %s ---", search_query)
     
-    # 2. (NEW) 의미 없는 URL 필터링
-    filtered_results = _filter_legal_search_results(raw_results)
-    
-    # 3. 기존 파이프라인 재사용
-    unique_results = deduplicate_search_results([filtered_results])
-    summarized_results = process_search_results(unique_results)
+    # 1. Tavily로 검색 실행 (더 많은 결과를 가져와서 필터링) → 2. 의미 없는 URL 필터링 → 3. 중복 제거 후 요약
+    summarized_results = await search_and_summarize(
+        [search_query],
+        result_filter=_filter_legal_search_results,
+        max_results=5,
+    )
     
     return format_search_output(summarized_results)
 
@@ -324,7 +516,7 @@ def case_law_search(query: str) -> str:
 def think_tool(reflection: str) -> str:
     """Tool for strategic reflection on research progress and decision-making.
 
-    Use this tool after each search to analyze results and plan next steps systematically.
+    Use this tool once after each batch of searches to analyze results and plan next steps systematically.
     This creates a deliberate pause in the research workflow for quality decision-making.
 
     When to use:
@@ -350,14 +542,16 @@ def think_tool(reflection: str) -> str:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
     # --- 1. statute_search (법령 검색) 테스트 ---
     print("\n" + "="*50)
     print("⚖️  'statute_search' 도구 테스트")
     print("="*50)
     statute_query = "주택임대차보호법 제8조 소액임차인 최우선변제권"
     print(f"질의: {statute_query}\n")
-    # @tool로 데코레이트된 함수는 .invoke() 메소드로 호출할 수 있습니다.
-    statute_result = statute_search.invoke({"query": statute_query})
+    # 검색 도구는 비동기 도구이므로 .ainvoke()로 호출합니다.
+    statute_result = asyncio.run(statute_search.ainvoke({"query": statute_query}))
     print("\n--- 결과 ---")
     print(statute_result)
     print("="*50)
@@ -369,7 +563,7 @@ if __name__ == "__main__":
     print("="*50)
     case_law_query = "전입신고 다음날 은행 근저당 설정 대항력"
     print(f"질의: {case_law_query}\n")
-    case_law_result = case_law_search.invoke({"query": case_law_query})
+    case_law_result = asyncio.run(case_law_search.ainvoke({"query": case_law_query}))
     print("\n--- 결과 ---")
     print(case_law_result)
     print("="*50)
\ No newline at end of file